@@ -1,27 +1,334 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.staticfiles import StaticFiles
 from motor.motor_asyncio import AsyncIOMotorClient
+import io
 import os
+import re
+import html
+import math
+import csv
+import time
+import gzip
+import asyncio
+import base64
+import bisect
+import hmac
+import hashlib
+import functools
+import contextlib
+import socket
+import shutil
 import logging
+import tempfile
+import threading
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import List, Literal, Optional, Dict, Any, Set
 import uuid
-from datetime import datetime
+import typer
+import uvicorn
+import orjson
+from datetime import datetime, timedelta, timezone
 from bson import ObjectId
+from pymongo import DeleteOne, IndexModel, InsertOne, ReturnDocument, UpdateOne
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, PyMongoError
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+try:
+    from PIL import Image, ImageFilter, features as image_features
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection. Pool settings left unset keep the driver defaults.
+MONGO_POOL_SETTINGS = {
+    'maxPoolSize': ('MONGO_MAX_POOL_SIZE', int),
+    'minPoolSize': ('MONGO_MIN_POOL_SIZE', int),
+    'maxIdleTimeMS': ('MONGO_MAX_IDLE_TIME_MS', int),
+    'waitQueueTimeoutMS': ('MONGO_WAIT_QUEUE_TIMEOUT_MS', int),
+    'connectTimeoutMS': ('MONGO_CONNECT_TIMEOUT_MS', int),
+    'socketTimeoutMS': ('MONGO_SOCKET_TIMEOUT_MS', int),
+    'serverSelectionTimeoutMS': ('MONGO_SERVER_SELECTION_TIMEOUT_MS', int),
+    'readPreference': ('MONGO_READ_PREFERENCE', str),
+    'compressors': ('MONGO_COMPRESSORS', str),
+}
+HEALTH_PING_TIMEOUT = float(os.environ.get('HEALTH_PING_TIMEOUT', '1.0'))
+HEALTH_CACHE_SECONDS = float(os.environ.get('HEALTH_CACHE_SECONDS', '1.0'))
+POOL_SATURATION_THRESHOLD = float(os.environ.get('POOL_SATURATION_THRESHOLD', '0.9'))
+
+def mongo_client_options() -> Dict[str, Any]:
+    """Motor client keyword arguments from the MONGO_* environment variables"""
+    options = {}
+    for option, (variable, cast) in MONGO_POOL_SETTINGS.items():
+        value = os.environ.get(variable)
+        if value:
+            options[option] = cast(value)
+    return options
+
+class PoolMonitor(ConnectionPoolListener):
+    """Connection pool occupancy per server, from driver pool events.
+
+    Events arrive on driver threads, so counters are updated under a lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.servers: Dict[str, Dict[str, int]] = {}
+
+    def _add(self, event, **deltas):
+        address = "%s:%s" % event.address
+        with self.lock:
+            counters = self.servers.setdefault(
+                address, {"connections": 0, "checkedOut": 0, "waiting": 0, "checkoutFailures": 0}
+            )
+            for name, delta in deltas.items():
+                counters[name] += delta
+
+    def pool_created(self, event):
+        self._add(event)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self.lock:
+            self.servers.pop("%s:%s" % event.address, None)
+
+    def connection_created(self, event):
+        self._add(event, connections=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(event, connections=-1)
+
+    def connection_check_out_started(self, event):
+        self._add(event, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(event, waiting=-1, checkoutFailures=1)
+
+    def connection_checked_out(self, event):
+        self._add(event, waiting=-1, checkedOut=1)
+
+    def connection_checked_in(self, event):
+        self._add(event, checkedOut=-1)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self.lock:
+            return {address: dict(counters) for address, counters in self.servers.items()}
+
+    def total(self, name: str) -> int:
+        with self.lock:
+            return sum(counters[name] for counters in self.servers.values())
+
+pool_monitor = PoolMonitor()
+mongo_options = mongo_client_options()
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+
+def create_mongo_client() -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(mongo_url, event_listeners=[pool_monitor], **mongo_options)
+
+# Created per process by connect_database(), never at import: a client must
+# not be shared across a fork, and each worker owns its own pool
+client: Optional[AsyncIOMotorClient] = None
+db = None
+
+def connect_database():
+    global client, db
+    if client is None:
+        client = create_mongo_client()
+        db = client[os.environ['DB_NAME']]
+
+def close_database():
+    global client, db
+    if client is not None:
+        client.close()
+    client = db = None
+
+# Cross-worker cache invalidation over Unix datagram sockets, and shared
+# metrics; the serve command sets this when it starts more than one worker
+PORTFOLIO_BUS_DIR = os.environ.get('PORTFOLIO_BUS_DIR', '')
+
+# Portfolio cache settings
+PORTFOLIO_CACHE_TTL = float(os.environ.get('PORTFOLIO_CACHE_TTL', '300'))
+PORTFOLIO_CACHE_MAX_VIEWS = int(os.environ.get('PORTFOLIO_CACHE_MAX_VIEWS', '4096'))
+PORTFOLIO_CACHE_MAX_BYTES = int(os.environ.get('PORTFOLIO_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+PORTFOLIO_CHANGE_STREAM = os.environ.get('PORTFOLIO_CHANGE_STREAM', 'true').lower() == 'true'
+PORTFOLIO_COLLECTIONS = ["portfolio_config", "experiences", "projects", "tech_stack"]
+
+# Tenancy: every portfolio document carries a tenant key (the profile slug)
+DEFAULT_TENANT = os.environ.get('DEFAULT_TENANT', 'default')
+TENANT_SLUG_PATTERN = re.compile(r"^[a-z0-9][a-z0-9-]{0,62}$")
+
+# createdAt is never rendered, so it is left out of the portfolio payload
+PORTFOLIO_RESPONSE_EXCLUDE = {
+    "experience": {"__all__": {"createdAt"}},
+    "projects": {"__all__": {"createdAt"}},
+}
+
+# Search
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', '50'))
+SEARCH_SNIPPET_CHARS = int(os.environ.get('SEARCH_SNIPPET_CHARS', '160'))
+SEARCH_MAX_TENANTS = int(os.environ.get('SEARCH_MAX_TENANTS', '256'))
+
+# Live portfolio updates (Server-Sent Events)
+EVENTS_POLL_INTERVAL = float(os.environ.get('EVENTS_POLL_INTERVAL', '30'))
+EVENTS_HEARTBEAT_INTERVAL = float(os.environ.get('EVENTS_HEARTBEAT_INTERVAL', '15'))
+EVENTS_DEBOUNCE = float(os.environ.get('EVENTS_DEBOUNCE', '0.2'))
+
+# Static snapshots written by `python server.py snapshot`; when set, the API
+# serves full-portfolio and whole-section reads from here and reloads them
+# whenever a tenant's manifest changes
+PORTFOLIO_SNAPSHOT_DIR = os.environ.get('PORTFOLIO_SNAPSHOT_DIR', '')
+PORTFOLIO_SNAPSHOT_CHECK_INTERVAL = float(os.environ.get('PORTFOLIO_SNAPSHOT_CHECK_INTERVAL', '2'))
+
+# Responsive project images, generated into a content-addressed cache
+IMAGES_ENABLED = os.environ.get('IMAGES_ENABLED', 'true').lower() == 'true'
+IMAGE_SOURCE_DIR = Path(os.environ.get('IMAGE_SOURCE_DIR', str(ROOT_DIR.parent / 'frontend' / 'public' / 'images' / 'projects')))
+IMAGE_CACHE_DIR = Path(os.environ.get('IMAGE_CACHE_DIR', str(ROOT_DIR / '.image_cache')))
+IMAGE_WIDTHS = [int(w) for w in os.environ.get('IMAGE_WIDTHS', '320,640,960,1280').split(',')]
+IMAGE_FORMATS = os.environ.get('IMAGE_FORMATS', 'avif,webp').split(',')
+IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', '70'))
+IMAGE_PLACEHOLDER_WIDTH = int(os.environ.get('IMAGE_PLACEHOLDER_WIDTH', '16'))
+
+# The built frontend; when present, / serves its index.html with the
+# portfolio embedded and the remaining files are served as static assets
+SPA_BUILD_DIR = Path(os.environ.get('SPA_BUILD_DIR', str(ROOT_DIR.parent / 'frontend' / 'build')))
+
+# Seeding: bump SEED_VERSION whenever the default content below changes
+SEED_VERSION = 3
+SEED_LOCK_TTL = int(os.environ.get('SEED_LOCK_TTL', '60'))
+
+# Admin API: disabled unless a bearer token is configured
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN', '')
+ADMIN_BATCH_MAX = int(os.environ.get('ADMIN_BATCH_MAX', '500'))
+
+# Load shedding: per-client token buckets on status ingestion, and a cap on
+# concurrent Mongo-bound requests (0 disables either). Both are enforced per
+# worker process: with several workers a client may reach each worker's rate,
+# and each worker gates at its own limit, which defaults to the size of its
+# own connection pool.
+STATUS_RATE_LIMIT = float(os.environ.get('STATUS_RATE_LIMIT', '10'))
+STATUS_RATE_BURST = float(os.environ.get('STATUS_RATE_BURST', '20'))
+STATUS_RATE_MAX_CLIENTS = int(os.environ.get('STATUS_RATE_MAX_CLIENTS', '10000'))
+MONGO_CONCURRENCY_LIMIT = int(os.environ.get('MONGO_CONCURRENCY_LIMIT', str(mongo_options.get('maxPoolSize', 100))))
+
+# Status rollups: per-client check counts per minute and per hour, kept
+# current on ingest so dashboards never scan raw status_checks
+STATUS_ROLLUP_GRANULARITIES = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1)}
+STATUS_ROLLUP_RETENTION_DAYS = {
+    "minute": int(os.environ.get('STATUS_ROLLUP_MINUTE_RETENTION_DAYS', '7')),
+    "hour": int(os.environ.get('STATUS_ROLLUP_HOUR_RETENTION_DAYS', '0')),
+}
+STATUS_STATS_MAX_BUCKETS = int(os.environ.get('STATUS_STATS_MAX_BUCKETS', '10080'))
+STATUS_STATS_TOP_CLIENTS = int(os.environ.get('STATUS_STATS_TOP_CLIENTS', '100'))
+
+# Reads from our own collections skip model validation unless this is set;
+# writes are always validated
+STRICT_READ_MODELS = os.environ.get('STRICT_READ_MODELS', '0') == '1'
+
+# Status check pagination
+STATUS_PAGE_DEFAULT = int(os.environ.get('STATUS_PAGE_DEFAULT', '100'))
+STATUS_PAGE_MAX = int(os.environ.get('STATUS_PAGE_MAX', '1000'))
+STATUS_EXPORT_BATCH_SIZE = int(os.environ.get('STATUS_EXPORT_BATCH_SIZE', '500'))
+
+# Status check ingestion
+STATUS_BULK_MAX = int(os.environ.get('STATUS_BULK_MAX', '1000'))
+STATUS_WRITE_BUFFER = os.environ.get('STATUS_WRITE_BUFFER', 'false').lower() == 'true'
+STATUS_BUFFER_MAX_SIZE = int(os.environ.get('STATUS_BUFFER_MAX_SIZE', '500'))
+STATUS_BUFFER_FLUSH_INTERVAL = float(os.environ.get('STATUS_BUFFER_FLUSH_INTERVAL', '0.5'))
+
+# Metrics. With several workers, each writes its samples to the bus
+# directory this often so a scrape of any worker covers all of them
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_SHARE_INTERVAL = float(os.environ.get('METRICS_SHARE_INTERVAL', '5'))
+
+# Index management
+STATUS_CHECK_TTL_SECONDS = int(os.environ.get('STATUS_CHECK_TTL_SECONDS', '0'))
+INDEX_CHECK = os.environ.get('INDEX_CHECK', 'false').lower() == 'true'
+
+# Declarative index registry: collection -> indexes applied idempotently at startup
+INDEXES: Dict[str, List[IndexModel]] = {
+    "portfolio_config": [IndexModel([("tenant", 1)], name="tenant_1", unique=True)],
+    "experiences": [IndexModel([("tenant", 1), ("order", 1)], name="tenant_1_order_1")],
+    "projects": [IndexModel(
+        [("tenant", 1), ("featured", -1), ("order", 1)],
+        name="tenant_1_featured_-1_order_1",
+    )],
+    "tech_stack": [IndexModel([("tenant", 1), ("order", 1)], name="tenant_1_order_1")],
+    "status_checks": [
+        IndexModel([("timestamp", -1), ("id", -1)], name="timestamp_-1_id_-1"),
+        IndexModel(
+            [("client_name", 1), ("timestamp", -1), ("id", -1)],
+            name="client_name_1_timestamp_-1_id_-1",
+        ),
+    ],
+}
+INDEXES["status_rollups"] = [
+    IndexModel(
+        [("granularity", 1), ("client_name", 1), ("bucket", 1)],
+        name="granularity_1_client_name_1_bucket_1",
+        unique=True,
+    ),
+    IndexModel([("granularity", 1), ("bucket", 1)], name="granularity_1_bucket_1"),
+    # Buckets carry expiresAt only when their granularity has a retention
+    IndexModel([("expiresAt", 1)], name="expiresAt_ttl", expireAfterSeconds=0),
+]
+if STATUS_CHECK_TTL_SECONDS > 0:
+    INDEXES["status_checks"].append(IndexModel(
+        [("timestamp", 1)], name="timestamp_ttl", expireAfterSeconds=STATUS_CHECK_TTL_SECONDS
+    ))
+
+# Queries the API issues, explained by the index check: (name, collection, filter, sort)
+INDEXED_QUERIES = [
+    ("portfolio.config", "portfolio_config", {"tenant": DEFAULT_TENANT}, {}),
+    ("portfolio.experiences", "experiences", {"tenant": DEFAULT_TENANT}, {"order": 1}),
+    ("portfolio.projects", "projects", {"tenant": DEFAULT_TENANT}, {"featured": -1, "order": 1}),
+    ("portfolio.tech_stack", "tech_stack", {"tenant": DEFAULT_TENANT}, {"order": 1}),
+    ("status.list", "status_checks", {}, {"timestamp": -1, "id": -1}),
+    ("status.list_by_client", "status_checks", {"client_name": ""}, {"timestamp": -1, "id": -1}),
+    ("status.export", "status_checks", {}, {"timestamp": 1, "id": 1}),
+    ("status.stats", "status_rollups", {"granularity": "hour", "bucket": {"$gte": datetime(1970, 1, 1)}}, {"bucket": 1}),
+    ("status.stats_by_client", "status_rollups", {"granularity": "hour", "client_name": ""}, {"bucket": 1}),
+]
+
+# JSON encoding
+def orjson_default(value):
+    """Encode the types orjson does not handle natively"""
+    if isinstance(value, BaseModel):
+        # Pydantic serializes the model to JSON itself, skipping a Python dict walk
+        return orjson.Fragment(value.model_dump_json())
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dump_json(data: Any) -> bytes:
+    return orjson.dumps(data, default=orjson_default)
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, accepting models, datetimes and ObjectIds"""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -67,6 +374,19 @@ class Experience(BaseModel):
     order: int = 0
     createdAt: datetime = Field(default_factory=datetime.utcnow)
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
+class ProjectImage(BaseModel):
+    width: int
+    height: int
+    placeholder: str
+    src: str
+    variants: List[ImageVariant]
+
 class Project(BaseModel):
     id: Optional[str] = None
     title: str
@@ -75,6 +395,8 @@ class Project(BaseModel):
     tech: List[str]
     order: int = 0
     featured: bool = False
+    image: Optional[str] = None
+    images: Optional[ProjectImage] = None
     createdAt: datetime = Field(default_factory=datetime.utcnow)
 
 class TechStack(BaseModel):
@@ -102,20 +424,833 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
-# Helper functions
-def serialize_doc(doc):
-    """Convert MongoDB document to JSON serializable format"""
-    if doc and '_id' in doc:
-        doc['id'] = str(doc['_id'])
-        del doc['_id']
-    return doc
+# Admin models
+class AdminOperation(BaseModel):
+    op: Literal["insert", "update", "delete"]
+    id: Optional[str] = None
+    # The version the client last read; documents never edited count as 0
+    version: Optional[int] = None
+    fields: Dict[str, Any] = Field(default_factory=dict)
+
+class AdminOrderEntry(BaseModel):
+    id: str
+    version: int = 0
+
+class AdminBatch(BaseModel):
+    tenant: str = DEFAULT_TENANT
+    operations: List[AdminOperation] = Field(default_factory=list)
+    # Sets order to each document's position in this list (1-based)
+    order: List[AdminOrderEntry] = Field(default_factory=list)
+
+# Metrics
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names, values) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+def with_label(sample: str, name: str, value) -> str:
+    """Prepend one label to a rendered sample line"""
+    label = f'{name}="{escape_label(value)}"'
+    metric, brace, rest = sample.partition("{")
+    if brace:
+        return f"{metric}{{{label},{rest}"
+    metric, _, rest = sample.partition(" ")
+    return f"{metric}{{{label}}} {rest}"
+
+class Counter:
+    """Monotonic counter keyed by a tuple of label values"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, labels)} {value}"
+            for labels, value in self._values.items()
+        ]
+
+class Histogram:
+    """Prometheus-style histogram keyed by a tuple of label values.
+
+    Each series stores per-bucket counts plus sum and count; buckets are only
+    made cumulative when rendered, so ``observe`` is a bisect and two adds.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, List[float]] = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            # One slot per bucket, one for +Inf, then sum and count
+            series = self._series[labels] = [0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                bucket_labels = format_labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            series_labels = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{series_labels} {series[-2]}")
+            lines.append(f"{self.name}_count{series_labels} {series[-1]}")
+        return lines
+
+class Gauge:
+    """Gauge whose value is read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback):
+        self.name = name
+        self.help = help
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        return [f"{self.name} {self.callback()}"]
+
+METRICS: List[Any] = []
+
+def register_metric(metric):
+    METRICS.append(metric)
+    return metric
+
+REQUEST_DURATION = register_metric(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code",
+    ("method", "route", "status"),
+))
+MONGO_DURATION = register_metric(Histogram(
+    "mongo_operation_duration_seconds",
+    "MongoDB operation latency by operation",
+    ("operation",),
+))
+MONGO_ERRORS = register_metric(Counter(
+    "mongo_operation_errors_total",
+    "MongoDB operations that raised",
+    ("operation",),
+))
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Label by route template, never the raw path, to bound cardinality
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                (scope["method"], route.path if route is not None else "unmatched", str(status)),
+                time.perf_counter() - start,
+            )
+
+async def timed_query(name: str, query, timings: Optional[Dict[str, float]] = None):
+    """Await a database operation, recording its duration per operation name"""
+    start = time.perf_counter()
+    try:
+        return await query
+    except Exception:
+        MONGO_ERRORS.inc((name,))
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        MONGO_DURATION.observe((name,), elapsed)
+        if timings is not None:
+            timings[name] = elapsed * 1000
+
+# Load shedding
+LOAD_DECISIONS = register_metric(Counter(
+    "load_decisions_total",
+    "Requests admitted or shed, by limiter",
+    ("limiter", "outcome"),
+))
+
+class TokenBucketLimiter:
+    """Per-key token buckets kept in a bounded LRU.
+
+    Buckets refill at ``rate`` tokens per second up to ``burst``. Only the
+    ``max_keys`` most recently seen keys are tracked; an evicted key simply
+    starts again with a full bucket, so memory stays bounded whatever the
+    number of distinct clients.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.buckets: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    def acquire(self, costs: Dict[str, float]) -> float:
+        """Take tokens for every key at once; returns 0, or the seconds to wait when any key is short"""
+        now = time.monotonic()
+        available = {}
+        wait = 0.0
+        for key, cost in costs.items():
+            bucket = self.buckets.get(key)
+            tokens = self.burst if bucket is None else min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            # A single request never costs more than a full bucket, or it could never pass
+            cost = min(cost, self.burst)
+            if tokens < cost:
+                wait = max(wait, (cost - tokens) / self.rate)
+            available[key] = tokens - cost
+        if wait:
+            return wait
+        for key, tokens in available.items():
+            self.buckets[key] = (tokens, now)
+            self.buckets.move_to_end(key)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return 0.0
+
+class ConcurrencyGate:
+    """Caps concurrent Mongo-bound requests; past the cap they fail fast instead of queueing"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+
+    def check(self):
+        """Shed now if the gate is full, without taking a slot"""
+        if self.limit and self.in_flight >= self.limit:
+            LOAD_DECISIONS.inc(("mongo", "shed"))
+            raise HTTPException(status_code=503, detail="Server busy", headers={"Retry-After": "1"})
+
+    @contextlib.asynccontextmanager
+    async def admit(self):
+        self.check()
+        LOAD_DECISIONS.inc(("mongo", "admitted"))
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+status_rate_limiter = TokenBucketLimiter(STATUS_RATE_LIMIT, STATUS_RATE_BURST, STATUS_RATE_MAX_CLIENTS)
+mongo_gate = ConcurrencyGate(MONGO_CONCURRENCY_LIMIT)
+
+def check_status_rate(client_names: List[str]):
+    """Charge one token per status check to each client; 429 when any is out of tokens"""
+    if not STATUS_RATE_LIMIT:
+        return
+    costs: Dict[str, float] = {}
+    for name in client_names:
+        costs[name] = costs.get(name, 0) + 1
+    wait = status_rate_limiter.acquire(costs)
+    if wait:
+        LOAD_DECISIONS.inc(("client", "shed"))
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+    LOAD_DECISIONS.inc(("client", "admitted"))
+
+async def mongo_admission():
+    """Route dependency holding a Mongo concurrency slot for the request"""
+    async with mongo_gate.admit():
+        yield
+
+class MetricsShare:
+    """Shares metric samples between sibling worker processes through files.
+
+    A scrape reaches whichever worker accepts the connection, so every worker
+    writes its samples, labelled with its pid, to ``metrics-<pid>.json`` in
+    the bus directory every ``interval`` seconds, and ``/metrics`` serves its
+    own live series plus its siblings' latest files. A file not rewritten for
+    three intervals belongs to a worker that has exited and is removed.
+    """
+
+    def __init__(self, directory: Path, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self.worker = str(os.getpid())
+        self.path = directory / f"metrics-{self.worker}.json"
+
+    def samples(self, metric) -> List[str]:
+        return [with_label(sample, "worker", self.worker) for sample in metric.samples()]
+
+    def publish(self):
+        write_atomic(self.path, orjson.dumps({metric.name: self.samples(metric) for metric in METRICS}))
+
+    def siblings(self) -> List[Dict[str, List[str]]]:
+        stale_before = time.time() - 3 * self.interval
+        found = []
+        for path in self.directory.glob("metrics-*.json"):
+            if path == self.path:
+                continue
+            try:
+                if path.stat().st_mtime < stale_before:
+                    path.unlink()
+                else:
+                    found.append(orjson.loads(path.read_bytes()))
+            except (OSError, ValueError):
+                # Removed by another worker meanwhile
+                continue
+        return found
+
+    async def run(self):
+        while True:
+            try:
+                self.publish()
+            except OSError as e:
+                logging.warning(f"Failed to publish metrics to {self.path}: {e}")
+            await asyncio.sleep(self.interval)
+
+    def close(self):
+        self.path.unlink(missing_ok=True)
+
+metrics_share = (
+    MetricsShare(Path(PORTFOLIO_BUS_DIR), METRICS_SHARE_INTERVAL)
+    if PORTFOLIO_BUS_DIR and METRICS_ENABLED else None
+)
+
+def render_metrics() -> str:
+    siblings = metrics_share.siblings() if metrics_share is not None else []
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples() if metrics_share is None else metrics_share.samples(metric))
+        for sibling in siblings:
+            lines.extend(sibling.get(metric.name, ()))
+    return "\n".join(lines) + "\n"
+
+# Read shapes for the portfolio collections. Documents come back from Mongo
+# already sorted, with _id renamed to a string id and unrendered fields
+# (createdAt) left behind, so no per-document work happens in Python.
+def document_pipeline(sort: Dict[str, int], fields: List[str]) -> List[Dict[str, Any]]:
+    projection: Dict[str, Any] = {"_id": 0, "id": {"$toString": "$_id"}}
+    projection.update((field, 1) for field in fields)
+    return [{"$sort": sort}, {"$project": projection}]
+
+# Fields never read from Mongo: id is derived from _id, images from the image catalog
+DERIVED_FIELDS = ("id", "images")
+
+def stored_fields(model) -> List[str]:
+    return [name for name in model.model_fields if name not in DERIVED_FIELDS + ("createdAt",)]
+
+PORTFOLIO_SORTS = {
+    "experiences": {"order": 1},
+    "projects": {"featured": -1, "order": 1},
+    "tech_stack": {"order": 1},
+}
+PORTFOLIO_CONFIG_PROJECTION = {"_id": 0, "personal": 1, "about": 1, "lookingFor": 1}
+PORTFOLIO_PIPELINES = {
+    "experiences": document_pipeline(PORTFOLIO_SORTS["experiences"], stored_fields(Experience)),
+    "projects": document_pipeline(PORTFOLIO_SORTS["projects"], stored_fields(Project)),
+    "tech_stack": [
+        {"$sort": PORTFOLIO_SORTS["tech_stack"]},
+        {"$project": {"_id": 0, "category": 1, "technologies": 1}},
+    ],
+}
+
+# Portfolio sections: response key -> (source collection, selectable fields).
+# techStack fields are category names, so any value is accepted.
+PORTFOLIO_SECTIONS = {
+    "personal": ("portfolio_config", list(PersonalInfo.model_fields)),
+    "about": ("portfolio_config", list(AboutInfo.model_fields)),
+    "experience": ("experiences", ["id"] + stored_fields(Experience)),
+    "projects": ("projects", ["id"] + stored_fields(Project) + ["images"]),
+    "techStack": ("tech_stack", None),
+    "lookingFor": ("portfolio_config", list(LookingForInfo.model_fields)),
+}
+CONFIG_SECTIONS = ["personal", "about", "lookingFor"]
+FULL_VIEW: Dict[str, Optional[List[str]]] = {section: None for section in PORTFOLIO_SECTIONS}
+
+def parse_portfolio_fields(fields: Optional[str], section: Optional[str] = None):
+    """Parse a fields= selection into {section: subfields, or None for all}.
+
+    Entries are section names or ``section.field`` paths; on a section
+    endpoint they are field names within that section.
+    """
+    if not fields:
+        return {section: None} if section else dict(FULL_VIEW)
+    selected: Dict[str, Optional[set]] = {}
+    for item in fields.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        path = f"{section}.{item}" if section else item
+        name, _, field = path.partition(".")
+        if name not in PORTFOLIO_SECTIONS:
+            raise HTTPException(status_code=400, detail=f"Unknown portfolio section '{name}'")
+        allowed = PORTFOLIO_SECTIONS[name][1]
+        if not field:
+            selected[name] = None
+        elif allowed is not None and field not in allowed:
+            raise HTTPException(status_code=400, detail=f"Unknown portfolio field '{path}'")
+        elif name not in selected:
+            selected[name] = {field}
+        elif selected[name] is not None:
+            selected[name].add(field)
+    if not selected:
+        raise HTTPException(status_code=400, detail="No portfolio fields selected")
+    return {
+        name: sorted(selected[name]) if selected[name] is not None else None
+        for name in PORTFOLIO_SECTIONS
+        if name in selected
+    }
+
+def view_key(view: Dict[str, Optional[List[str]]]) -> str:
+    """Canonical cache key for a parsed view"""
+    return ",".join(
+        name if fields is None else ",".join(f"{name}.{field}" for field in fields)
+        for name, fields in view.items()
+    )
+
+def section_pipeline(section: str, fields: Optional[List[str]], tenant: str) -> List[Dict[str, Any]]:
+    """Read pipeline for one tenant's section, narrowed to the selected fields"""
+    collection = PORTFOLIO_SECTIONS[section][0]
+    match: Dict[str, Any] = {"tenant": tenant}
+    if fields is None:
+        return [{"$match": match}] + PORTFOLIO_PIPELINES[collection]
+    if section == "techStack":
+        match["category"] = {"$in": fields}
+        return [{"$match": match}] + PORTFOLIO_PIPELINES[collection]
+    stored = [f for f in fields if f not in DERIVED_FIELDS]
+    if "images" in fields and "image" not in stored:
+        stored.append("image")
+    return [{"$match": match}] + document_pipeline(PORTFOLIO_SORTS[collection], stored)
+
+def config_projection(view: Dict[str, Optional[List[str]]]) -> Dict[str, int]:
+    """portfolio_config projection covering the selected config sections"""
+    projection = {"_id": 0}
+    for section in CONFIG_SECTIONS:
+        if section not in view:
+            continue
+        if view[section] is None:
+            projection[section] = 1
+        else:
+            projection.update((f"{section}.{field}", 1) for field in view[section])
+    return projection
+
+class PortfolioCache:
+    """Versioned in-memory snapshots of assembled portfolio responses.
+
+    Snapshots are keyed by tenant and view (the full document, one section,
+    or a field selection) and kept in one LRU bounded by both entry count
+    and encoded bytes, so hot profiles stay resident and cold ones are
+    rebuilt on demand. Each tenant has its own content version; bumping the
+    global epoch invalidates every tenant at once. Entries also expire after
+    ``ttl`` seconds (``ttl <= 0`` disables time-based expiry). Concurrent
+    misses for the same key share a single rebuild.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 4096, max_bytes: int = 256 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.epoch = 0
+        self.versions: Dict[str, int] = {}
+        self.nbytes = 0
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+
+    def version_of(self, tenant: str) -> tuple:
+        return (self.epoch, self.versions.get(tenant, 0))
+
+    def invalidate(self, tenant: Optional[str] = None):
+        if tenant is None:
+            self.epoch += 1
+            # Every entry is stale under the new epoch, so per-tenant counters can restart
+            self.versions.clear()
+        else:
+            self.versions[tenant] = self.versions.get(tenant, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[3]
+
+    def _lookup(self, key: tuple):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, version, built_at, _ = entry
+        expired = self.ttl > 0 and time.monotonic() - built_at >= self.ttl
+        if version != self.version_of(key[0]) or expired:
+            self._evict(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: tuple, version: tuple, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        size = getattr(value, "nbytes", 0)
+        self._evict(key)
+        self._entries[key] = (value, version, time.monotonic(), size)
+        self.nbytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+            self._evict(next(iter(self._entries)))
+
+    async def get(self, builder, tenant: str = DEFAULT_TENANT, key: str = "*"):
+        cache_key = (tenant, key)
+        value = self._lookup(cache_key)
+        if value is not None:
+            return value
+        task = self._inflight.get(cache_key)
+        if task is None:
+            # The rebuild runs as its own task so a disconnecting client
+            # cannot cancel it out from under the other waiters
+            task = asyncio.ensure_future(builder())
+            task.add_done_callback(
+                functools.partial(self._store, cache_key, self.version_of(tenant))
+            )
+            self._inflight[cache_key] = task
+        return await asyncio.shield(task)
+
+class PayloadSnapshot:
+    """JSON body serialized once, with precompressed variants and an ETag"""
+
+    __slots__ = ("digest", "encoded", "timings")
+
+    def __init__(self, data: Any, timings: Optional[Dict[str, float]] = None):
+        self._encode(dump_json(data))
+        self.timings = timings or {}
+
+    def _encode(self, body: bytes):
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.encoded = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.encoded["br"] = brotli.compress(body, quality=11)
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "PayloadSnapshot":
+        """Snapshot of an already rendered body, such as the SPA shell"""
+        snapshot = cls.__new__(cls)
+        snapshot._encode(body)
+        snapshot.timings = {}
+        return snapshot
+
+    @classmethod
+    def from_encoded(cls, digest: str, encoded: Dict[str, bytes]) -> "PayloadSnapshot":
+        """Wrap variants that were serialized and compressed ahead of time"""
+        snapshot = cls.__new__(cls)
+        snapshot.digest = digest
+        snapshot.encoded = encoded
+        snapshot.timings = {}
+        return snapshot
+
+    @property
+    def body(self) -> bytes:
+        return self.encoded["identity"]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(variant) for variant in self.encoded.values())
+
+    def etag(self, encoding: str = "identity") -> str:
+        # Each content-coding is a distinct representation, so it gets its own strong tag
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.digest}{suffix}"'
+
+def choose_encoding(accept_encoding: str, available) -> str:
+    """Pick the best available content-coding allowed by Accept-Encoding"""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and q > 0:
+            return encoding
+    return "identity"
+
+def etag_matches(if_none_match: Optional[str], digest: str) -> bool:
+    """Check If-None-Match against any encoding variant of a snapshot"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        if tag.split("-", 1)[0] == digest:
+            return True
+    return False
+
+def snapshot_response(
+    request: Request, snapshot: PayloadSnapshot, media_type: str = "application/json"
+) -> Response:
+    """Serve a cached snapshot, answering conditional requests with 304"""
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), snapshot.encoded)
+    headers = {
+        "ETag": snapshot.etag(encoding),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), snapshot.digest):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    if snapshot.timings:
+        # Per-collection query times from the build that produced this snapshot
+        headers["Server-Timing"] = ", ".join(
+            f"db-{name};dur={ms:.1f}" for name, ms in snapshot.timings.items()
+        )
+    return Response(
+        content=snapshot.encoded[encoding],
+        media_type=media_type,
+        headers=headers,
+    )
+
+portfolio_cache = PortfolioCache(
+    PORTFOLIO_CACHE_TTL, PORTFOLIO_CACHE_MAX_VIEWS, PORTFOLIO_CACHE_MAX_BYTES
+)
+
+def invalidate_portfolio_cache(tenant: Optional[str] = None, broadcast: bool = True):
+    """Bump the content version of one tenant, or of all tenants, after a write.
+
+    Sibling workers are told too unless ``broadcast`` is off, which is for
+    invalidations every worker observes on its own (change streams).
+    """
+    portfolio_cache.invalidate(tenant)
+    event_hub.notify(tenant)
+    if broadcast and invalidation_bus is not None:
+        invalidation_bus.publish(tenant)
+
+class InvalidationProtocol(asyncio.DatagramProtocol):
+    def datagram_received(self, data: bytes, addr):
+        tenant = data.decode("utf-8", "replace")
+        invalidate_portfolio_cache(None if tenant == "*" else tenant, broadcast=False)
+
+class InvalidationBus:
+    """Broadcasts portfolio cache invalidations to sibling worker processes.
+
+    Each worker binds a datagram socket named after its pid in the bus
+    directory; publishing is one non-blocking sendto per sibling, and sockets
+    left behind by dead workers are removed when a send is refused.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.path = directory / f"{os.getpid()}.sock"
+        self.sock: Optional[socket.socket] = None
+        self.transport = None
+
+    async def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(str(self.path))
+        self.sock.setblocking(False)
+        self.transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            InvalidationProtocol, sock=self.sock
+        )
+        logging.info(f"Listening for cache invalidations on {self.path}")
+
+    def publish(self, tenant: Optional[str]):
+        if self.sock is None:
+            return
+        message = (tenant or "*").encode("utf-8")
+        for path in self.directory.glob("*.sock"):
+            if path == self.path:
+                continue
+            try:
+                self.sock.sendto(message, str(path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                path.unlink(missing_ok=True)
+            except BlockingIOError:
+                # The sibling is not draining its socket; its TTL still bounds staleness
+                logging.warning(f"Dropped cache invalidation for {path.name}: receive buffer full")
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        self.sock = self.transport = None
+        self.path.unlink(missing_ok=True)
+
+invalidation_bus = InvalidationBus(Path(PORTFOLIO_BUS_DIR)) if PORTFOLIO_BUS_DIR else None
+
+async def watch_portfolio_changes():
+    """Invalidate the portfolio cache from a MongoDB change stream"""
+    pipeline = [{"$match": {"ns.coll": {"$in": PORTFOLIO_COLLECTIONS}}}]
+    while True:
+        try:
+            async with db.watch(pipeline, full_document="updateLookup") as stream:
+                event_hub.change_stream_active = True
+                async for change in stream:
+                    # Deletes carry no document, so their tenant is unknown
+                    tenant = (change.get("fullDocument") or {}).get("tenant")
+                    index = search_indexes.get(tenant) if tenant else None
+                    index_was_current = index is not None and index.is_current()
+                    invalidate_portfolio_cache(tenant, broadcast=False)
+                    # Keep the search index current incrementally when we can;
+                    # otherwise it is rebuilt on the next search
+                    if index_was_current and apply_search_change(index, change):
+                        index.mark_current(portfolio_cache.version_of(tenant))
+        except OperationFailure as e:
+            # Standalone servers do not support change streams; rely on TTL
+            logging.info(f"Change stream unavailable, using TTL invalidation only: {e}")
+            event_hub.change_stream_active = False
+            return
+        except PyMongoError as e:
+            logging.warning(f"Change stream interrupted: {e}")
+            event_hub.change_stream_active = False
+            invalidate_portfolio_cache(broadcast=False)
+            await asyncio.sleep(5)
+
+def seed_upserts(
+    docs: List[Dict[str, Any]], key: str, tenant: str, backfill: List[str] = ()
+) -> List[UpdateOne]:
+    """Insert-only upserts keyed on tenant and a natural key, so reseeding never duplicates.
+
+    Fields named in ``backfill`` are also set on already-seeded documents
+    that lack them, without touching documents where they were edited.
+    """
+    operations = [
+        UpdateOne(
+            {"tenant": tenant, key: doc[key]},
+            {"$setOnInsert": dict(doc, tenant=tenant)},
+            upsert=True,
+        )
+        for doc in docs
+    ]
+    operations.extend(
+        UpdateOne(
+            {"tenant": tenant, key: doc[key], field: {"$exists": False}},
+            {"$set": {field: doc[field]}},
+        )
+        for doc in docs
+        for field in backfill
+        if field in doc
+    )
+    return operations
+
+# Natural key per portfolio collection, as used by the seed upserts; the
+# config is a single document per tenant
+SEED_KEYS = {"portfolio_config": None, "experiences": "company", "projects": "title", "tech_stack": "category"}
+
+async def backfill_tenant_key():
+    """Assign documents written before multi-tenancy to the default tenant.
+
+    Workers that raced on an old release could seed twice, leaving duplicate
+    tenant-less documents. Only the oldest per natural key is kept, and none
+    the default tenant already has, so the unique config index can be built.
+    """
+    for collection, key in SEED_KEYS.items():
+        projection = {key or "_id": 1}
+        claimed = {
+            doc.get(key) if key else None
+            async for doc in db[collection].find({"tenant": DEFAULT_TENANT}, projection)
+        }
+        duplicates = []
+        async for doc in db[collection].find({"tenant": {"$exists": False}}, projection).sort("_id", 1):
+            value = doc.get(key) if key else None
+            if value in claimed:
+                duplicates.append(doc["_id"])
+            claimed.add(value)
+        if duplicates:
+            await db[collection].delete_many({"_id": {"$in": duplicates}})
+            logging.warning(f"Removed {len(duplicates)} duplicate {collection} documents left by an earlier double seed")
+        result = await db[collection].update_many(
+            {"tenant": {"$exists": False}}, {"$set": {"tenant": DEFAULT_TENANT}}
+        )
+        if result.modified_count:
+            logging.info(f"Assigned {result.modified_count} {collection} documents to tenant {DEFAULT_TENANT}")
+            invalidate_portfolio_cache(DEFAULT_TENANT)
+
+async def acquire_seed_lock(owner: str) -> bool:
+    """Take the cross-worker seeding lock, stealing it once it has expired"""
+    now = datetime.utcnow()
+    try:
+        await db.portfolio_meta.update_one(
+            {"_id": "seed_lock", "expiresAt": {"$lt": now}},
+            {"$set": {"owner": owner, "expiresAt": now + timedelta(seconds=SEED_LOCK_TTL)}},
+            upsert=True,
+        )
+        return True
+    except DuplicateKeyError:
+        # The lock document exists and has not expired
+        return False
 
 async def init_portfolio_data():
     """Initialize portfolio with mock data if not exists"""
-    portfolio_exists = await db.portfolio_config.find_one()
-    if portfolio_exists:
+    marker = await db.portfolio_meta.find_one({"_id": "seed"})
+    if marker and marker.get("version", 0) >= SEED_VERSION:
+        return
+    
+    owner = str(uuid.uuid4())
+    if not await acquire_seed_lock(owner):
+        # Another worker is seeding; wait for it rather than racing it
+        deadline = time.monotonic() + SEED_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+            marker = await db.portfolio_meta.find_one({"_id": "seed"})
+            if marker and marker.get("version", 0) >= SEED_VERSION:
+                return
+        logging.warning("Timed out waiting for another worker to seed portfolio data")
         return
     
+    try:
+        await backfill_tenant_key()
+        await seed_portfolio_data()
+        await db.portfolio_meta.update_one(
+            {"_id": "seed"},
+            {"$set": {"version": SEED_VERSION, "seededAt": datetime.utcnow()}},
+            upsert=True,
+        )
+    finally:
+        await db.portfolio_meta.delete_one({"_id": "seed_lock", "owner": owner})
+
+async def seed_portfolio_data(tenant: str = DEFAULT_TENANT):
+    """Upsert the default portfolio content in one bulk write per collection"""
     # Initialize with mock data
     mock_personal = {
         "name": "Cody Christ",
@@ -143,13 +1278,14 @@ async def init_portfolio_data():
         "description": "I'm eager to contribute my skills and experience to innovative projects that leverage real-time data, AI, and cloud technologies to solve complex problems. Looking for opportunities in data analytics, AI/ML platforms, or full-stack development roles where I can make an immediate impact with cross-functional teams."
     }
     
-    # Insert portfolio config
-    await db.portfolio_config.insert_one({
+    # Insert portfolio config (a single document, only if none exists)
+    config_result = await db.portfolio_config.update_one({"tenant": tenant}, {"$setOnInsert": {
+        "tenant": tenant,
         "personal": mock_personal,
         "about": mock_about,
         "lookingFor": mock_looking_for,
         "updatedAt": datetime.utcnow()
-    })
+    }}, upsert=True)
     
     # Insert experiences
     mock_experiences = [
@@ -200,8 +1336,9 @@ async def init_portfolio_data():
         }
     ]
     
-    for exp in mock_experiences:
-        await db.experiences.insert_one(exp)
+    experiences_result = await db.experiences.bulk_write(
+        seed_upserts(mock_experiences, "company", tenant), ordered=False
+    )
     
     # Insert projects
     mock_projects = [
@@ -239,6 +1376,7 @@ async def init_portfolio_data():
             "tech": ["React", "D3.js", "WebSockets", "Python", "GraphQL", "Redis", "Kafka"],
             "order": 4,
             "featured": True,
+            "image": "realtime-tracking",
             "createdAt": datetime.utcnow()
         },
         {
@@ -248,12 +1386,14 @@ async def init_portfolio_data():
             "tech": ["GitHub Actions", "Docker", "Terraform", "AWS", "Kubernetes", "Jest", "Playwright"],
             "order": 5,
             "featured": True,
+            "image": "devex-platform",
             "createdAt": datetime.utcnow()
         }
     ]
     
-    for project in mock_projects:
-        await db.projects.insert_one(project)
+    projects_result = await db.projects.bulk_write(
+        seed_upserts(mock_projects, "title", tenant, backfill=["image"]), ordered=False
+    )
     
     # Insert comprehensive tech stack categories
     tech_categories = [
@@ -335,84 +1475,1515 @@ async def init_portfolio_data():
         }
     ]
     
-    for tech in tech_categories:
-        await db.tech_stack.insert_one(tech)
+    tech_result = await db.tech_stack.bulk_write(
+        seed_upserts(tech_categories, "category", tenant), ordered=False
+    )
+
+    inserted = (
+        (1 if config_result.upserted_id is not None else 0)
+        + experiences_result.upserted_count
+        + projects_result.upserted_count
+        + tech_result.upserted_count
+    )
+    if inserted:
+        logging.info(f"Seeded {inserted} portfolio documents for tenant {tenant}")
+        invalidate_portfolio_cache(tenant)
 
 # Portfolio API Routes
-@api_router.get("/portfolio", response_model=PortfolioData)
-async def get_portfolio():
-    """Get complete portfolio data"""
+async def fetch_portfolio_sources(
+    view: Dict[str, Optional[List[str]]] = FULL_VIEW,
+    tenant: str = DEFAULT_TENANT,
+):
+    """Read the collections a tenant's view needs concurrently, returning docs and timings"""
+    timings: Dict[str, float] = {}
+    # The config document is what makes a tenant exist, so views without a
+    # config section still read its _id to tell an unknown slug from an empty one
+    projection = config_projection(view) if any(section in view for section in CONFIG_SECTIONS) else {"_id": 1}
+    queries = {
+        "portfolio_config": timed_query(
+            "portfolio_config.find_one",
+            db.portfolio_config.find_one({"tenant": tenant}, projection),
+            timings,
+        )
+    }
+    for section in ("experience", "projects", "techStack"):
+        if section not in view:
+            continue
+        collection = PORTFOLIO_SECTIONS[section][0]
+        queries[collection] = timed_query(
+            f"{collection}.aggregate",
+            db[collection].aggregate(
+                section_pipeline(section, view[section], tenant)
+            ).to_list(length=None),
+            timings,
+        )
+    results = await asyncio.gather(*queries.values())
+    return dict(zip(queries, results)), timings
+
+def group_tech_stack(tech_docs: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Group tech stack documents by category, keeping their sort order"""
+    return {tech["category"]: tech["technologies"] for tech in tech_docs}
+
+def build_portfolio(sources: Dict[str, Any]) -> PortfolioData:
+    """Assemble the portfolio response from fetched collection documents"""
+    config = sources["portfolio_config"]
+    if not config:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    
+    # Construct response
+    portfolio_data = {
+        "personal": config["personal"],
+        "about": config["about"], 
+        "experience": sources["experiences"],
+        "projects": sources["projects"],
+        "techStack": group_tech_stack(sources["tech_stack"]),
+        "lookingFor": config["lookingFor"]
+    }
+    
+    return PortfolioData(**portfolio_data)
+
+def read_defaults(model) -> Dict[str, Any]:
+    """Plain defaults a trusted read fills in for fields a stored document may lack"""
+    return {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if not field.is_required() and field.default_factory is None
+    }
+
+# Sections rendered from documents of a model with defaults, so trusted reads
+# come out with the same keys a validated model_dump would produce
+READ_DEFAULTS = {"experience": read_defaults(Experience), "projects": read_defaults(Project)}
+
+def build_portfolio_view(sources: Dict[str, Any], view: Dict[str, Optional[List[str]]]) -> Dict[str, Any]:
+    """Assemble the sections of a view.
+
+    Documents were validated when written and arrive already shaped by the
+    read pipelines, so they are used as plain dicts; STRICT_READ_MODELS
+    validates the full document through PortfolioData instead.
+    """
+    if "projects" in sources and "images" in (view["projects"] or ["images"]):
+        attach_project_images(sources["projects"])
+    if view == FULL_VIEW and STRICT_READ_MODELS:
+        return build_portfolio(sources).model_dump(exclude=PORTFOLIO_RESPONSE_EXCLUDE)
+    if "portfolio_config" in sources and not sources["portfolio_config"]:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    data = {}
+    for section in view:
+        collection = PORTFOLIO_SECTIONS[section][0]
+        if collection == "portfolio_config":
+            data[section] = sources["portfolio_config"].get(section, {})
+        elif section == "techStack":
+            data[section] = group_tech_stack(sources[collection])
+        elif view[section] is None:
+            defaults = READ_DEFAULTS[section]
+            data[section] = [{**defaults, **doc} for doc in sources[collection]]
+        else:
+            data[section] = sources[collection]
+    return data
+
+def attach_project_images(projects: List[Dict[str, Any]]):
+    """Add responsive image metadata to projects whose source image is known"""
+    for project in projects:
+        images = image_catalog.get(project.get("image"))
+        if images is not None:
+            project["images"] = images
+
+async def build_portfolio_snapshot(
+    view: Dict[str, Optional[List[str]]] = FULL_VIEW,
+    section: Optional[str] = None,
+    tenant: str = DEFAULT_TENANT,
+) -> PayloadSnapshot:
+    """Assemble and serialize a portfolio view, or a single section of it"""
+    start = time.perf_counter()
+    sources, timings = await fetch_portfolio_sources(view, tenant)
+    data = build_portfolio_view(sources, view)
+    # gzip-9 and brotli-11 take tens of milliseconds on a full portfolio;
+    # both release the GIL, so the event loop keeps serving meanwhile
+    snapshot = await asyncio.to_thread(PayloadSnapshot, data[section] if section else data, timings)
+    breakdown = ", ".join(f"{name}={ms:.1f}ms" for name, ms in timings.items())
+    logging.info(
+        f"Portfolio snapshot [{tenant}/{view_key(view)}] rebuilt in "
+        f"{(time.perf_counter() - start) * 1000:.1f}ms ({breakdown})"
+    )
+    return snapshot
+
+# Static snapshots
+SNAPSHOT_SUFFIXES = {"identity": ".json", "gzip": ".json.gz", "br": ".json.br"}
+
+def write_atomic(path: Path, data: bytes):
+    # A unique temp name per writer, since every worker may build the same files at once
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as tmp:
+        tmp.write(data)
     try:
-        # Get portfolio config
-        config = await db.portfolio_config.find_one()
-        if not config:
-            raise HTTPException(status_code=404, detail="Portfolio not found")
-        
-        # Get experiences (ordered)
-        experiences_cursor = db.experiences.find().sort("order", 1)
-        experiences_raw = await experiences_cursor.to_list(length=None)
-        experiences = [serialize_doc(exp) for exp in experiences_raw]
-        
-        # Get projects (ordered, featured first)
-        projects_cursor = db.projects.find().sort([("featured", -1), ("order", 1)])
-        projects_raw = await projects_cursor.to_list(length=None)
-        projects = [serialize_doc(proj) for proj in projects_raw]
-        
-        # Get tech stack (ordered)
-        tech_cursor = db.tech_stack.find().sort("order", 1)
-        tech_raw = await tech_cursor.to_list(length=None)
-        
-        # Format tech stack for frontend compatibility
-        tech_stack = {}
-        for tech in tech_raw:
-            category = tech["category"]
-            if category == "frontend":
-                tech_stack["frontend"] = tech["technologies"]
-            elif category == "performance":
-                tech_stack["performance"] = tech["technologies"]  
-            elif category == "backend":
-                tech_stack["backend"] = tech["technologies"]
-            elif category == "cloud":
-                tech_stack["cloud"] = tech["technologies"]
-            elif category == "tools":
-                tech_stack["tools"] = tech["technologies"]
-            elif category == "methodologies":
-                tech_stack["methodologies"] = tech["technologies"]
-        
-        # Construct response
-        portfolio_data = {
-            "personal": config["personal"],
-            "about": config["about"], 
-            "experience": experiences,
-            "projects": projects,
-            "techStack": tech_stack,
-            "lookingFor": config["lookingFor"]
+        # mkstemp files are owner-only; snapshots may be served by a separate web server
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+async def write_portfolio_snapshot(directory: Path, tenant: str = DEFAULT_TENANT) -> Dict[str, Any]:
+    """Write a tenant's portfolio and each section as content-hashed JSON files.
+
+    Files are named ``<name>.<digest>.json`` with ``.gz`` and ``.br`` variants,
+    so they can be served as immutable. ``manifest.json`` is replaced last and
+    points at the current set; files from the previous manifest are kept for
+    clients that are still reading them, and anything older is removed.
+    """
+    sources, _ = await fetch_portfolio_sources(FULL_VIEW, tenant)
+    data = build_portfolio_view(sources, FULL_VIEW)
+    target = directory / tenant
+    target.mkdir(parents=True, exist_ok=True)
+    manifest_path = target / "manifest.json"
+    previous = orjson.loads(manifest_path.read_bytes()) if manifest_path.exists() else {}
+
+    files = {}
+    for name, value in {"portfolio": data, **data}.items():
+        snapshot = PayloadSnapshot(value)
+        entry = {"digest": snapshot.digest}
+        for encoding, body in snapshot.encoded.items():
+            filename = f"{name}.{snapshot.digest}{SNAPSHOT_SUFFIXES[encoding]}"
+            if not (target / filename).exists():
+                write_atomic(target / filename, body)
+            entry[encoding] = filename
+        files[name] = entry
+
+    manifest = {
+        "tenant": tenant,
+        "version": files["portfolio"]["digest"],
+        "previous": previous.get("version"),
+        "generatedAt": datetime.utcnow().isoformat(),
+        "files": files,
+    }
+    if previous.get("version") != manifest["version"]:
+        write_atomic(manifest_path, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+        keep = {
+            filename
+            for snapshot_manifest in (manifest, previous)
+            for entry in snapshot_manifest.get("files", {}).values()
+            for encoding, filename in entry.items()
+            if encoding != "digest"
         }
-        
-        return PortfolioData(**portfolio_data)
-        
+        for path in target.iterdir():
+            if path.name != "manifest.json" and not path.name.startswith(".") and path.name not in keep:
+                path.unlink()
+    return manifest
+
+class SnapshotStore:
+    """Serves snapshot files from disk, reloading a tenant when its manifest changes.
+
+    Manifests are stat'ed at most once per ``check_interval`` per tenant, so
+    rerunning the snapshot command is picked up without a restart.
+    """
+
+    def __init__(self, directory: Path, check_interval: float):
+        self.directory = directory
+        self.check_interval = check_interval
+        # tenant -> (manifest mtime, checked at, name -> PayloadSnapshot)
+        self._tenants: Dict[str, tuple] = {}
+
+    def get(self, tenant: str, name: str) -> Optional[PayloadSnapshot]:
+        now = time.monotonic()
+        entry = self._tenants.get(tenant)
+        if entry is None or now - entry[1] >= self.check_interval:
+            entry = self._reload(tenant, entry, now)
+            if entry is None:
+                return None
+        return entry[2].get(name)
+
+    def _reload(self, tenant: str, entry: Optional[tuple], now: float) -> Optional[tuple]:
+        target = self.directory / tenant
+        try:
+            mtime = (target / "manifest.json").stat().st_mtime_ns
+        except OSError:
+            self._tenants.pop(tenant, None)
+            return None
+        if entry is not None and entry[0] == mtime:
+            entry = (mtime, now, entry[2])
+        else:
+            try:
+                manifest = orjson.loads((target / "manifest.json").read_bytes())
+                payloads = {
+                    name: PayloadSnapshot.from_encoded(files["digest"], {
+                        encoding: (target / filename).read_bytes()
+                        for encoding, filename in files.items()
+                        if encoding in SNAPSHOT_SUFFIXES
+                    })
+                    for name, files in manifest["files"].items()
+                }
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Failed to load portfolio snapshot for {tenant}: {e}")
+                if entry is None:
+                    return None
+                payloads = entry[2]
+            else:
+                logging.info(f"Loaded portfolio snapshot {manifest['version']} for {tenant}")
+            entry = (mtime, now, payloads)
+        self._tenants[tenant] = entry
+        return entry
+
+snapshot_store = (
+    SnapshotStore(Path(PORTFOLIO_SNAPSHOT_DIR), PORTFOLIO_SNAPSHOT_CHECK_INTERVAL)
+    if PORTFOLIO_SNAPSHOT_DIR else None
+)
+
+async def admitted(build):
+    # Only cache misses reach Mongo, so only they take a concurrency slot
+    async with mongo_gate.admit():
+        return await build()
+
+async def tech_categories(tenant: str) -> frozenset:
+    """The tenant's stored techStack categories, cached alongside its views"""
+    async def build():
+        return frozenset(await db.tech_stack.distinct("category", {"tenant": tenant}))
+
+    return await portfolio_cache.get(lambda: admitted(build), tenant, "#techStack.categories")
+
+async def get_portfolio_snapshot(
+    view: Dict[str, Optional[List[str]]] = FULL_VIEW,
+    section: Optional[str] = None,
+    tenant: str = DEFAULT_TENANT,
+) -> PayloadSnapshot:
+    """A portfolio view from the static snapshot when one covers it, else from the cache"""
+    if snapshot_store is not None and view == ({section: None} if section else FULL_VIEW):
+        snapshot = snapshot_store.get(tenant, section or "portfolio")
+        if snapshot is not None:
+            return snapshot
+    if view.get("techStack"):
+        # Categories are free-form, so only stored ones may name a view;
+        # anything else would mint a cache entry per distinct query string
+        unknown = set(view["techStack"]) - await tech_categories(tenant)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown portfolio field 'techStack.{min(unknown)}'")
+    key = f"{section}:{view_key(view)}" if section else view_key(view)
+    return await portfolio_cache.get(
+        lambda: admitted(functools.partial(build_portfolio_snapshot, view, section, tenant)), tenant, key
+    )
+
+async def serve_portfolio(
+    request: Request,
+    view,
+    section: Optional[str] = None,
+    tenant: str = DEFAULT_TENANT,
+) -> Response:
+    """Serve a tenant's portfolio view from its cached snapshot"""
+    try:
+        return snapshot_response(request, await get_portfolio_snapshot(view, section, tenant))
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error fetching portfolio: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+# Path segments under /api/portfolio that can never be profile slugs
+RESERVED_SLUGS = set(PORTFOLIO_SECTIONS) | {"events"}
+
+def check_tenant_slug(slug: str) -> str:
+    if slug in RESERVED_SLUGS or not TENANT_SLUG_PATTERN.match(slug):
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return slug
+
+@api_router.get("/portfolio", response_model=PortfolioData)
+async def get_portfolio(request: Request, fields: Optional[str] = None):
+    """Get complete portfolio data, or only the sections and fields selected"""
+    return await serve_portfolio(request, parse_portfolio_fields(fields))
+
+# Project images
+IMAGE_SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+IMAGE_FILENAME_PATTERN = re.compile(r"^[0-9a-f]{16}-\d+\.(avif|webp|jpeg)$")
+IMAGE_SAVE_OPTIONS = {"avif": {"speed": 6}, "webp": {"method": 6}, "jpeg": {"optimize": True, "progressive": True}}
+
+class ImageCatalog:
+    """Responsive variants of the project images, keyed by source file stem.
+
+    Each source is hashed and its variants are written to the cache directory
+    as ``<hash>-<width>.<format>`` along with a ``<hash>.json`` metadata file,
+    so unchanged images are never decoded again and edited ones get new URLs.
+    When a stem exists in several formats the lossless one is used.
+    """
+
+    def __init__(self, source_dir: Path, cache_dir: Path, widths: List[int], formats: List[str]):
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir
+        self.widths = sorted(widths)
+        self.formats = formats
+        self.images: Dict[str, Dict[str, Any]] = {}
+
+    def get(self, name: Optional[str]) -> Optional[Dict[str, Any]]:
+        return self.images.get(name) if name else None
+
+    def path(self, filename: str) -> Optional[Path]:
+        if not IMAGE_FILENAME_PATTERN.match(filename):
+            return None
+        path = self.cache_dir / filename
+        return path if path.is_file() else None
+
+    def sources(self) -> Dict[str, Path]:
+        found: Dict[str, Path] = {}
+        for path in sorted(self.source_dir.iterdir()):
+            suffix = path.suffix.lower()
+            if suffix not in IMAGE_SOURCE_SUFFIXES:
+                continue
+            current = found.get(path.stem)
+            if current is None or IMAGE_SOURCE_SUFFIXES.index(suffix) < IMAGE_SOURCE_SUFFIXES.index(current.suffix.lower()):
+                found[path.stem] = path
+        return found
+
+    def variant_widths(self, width: int) -> List[int]:
+        # Never upscale: narrower sources get a single variant at their own width
+        widths = [w for w in self.widths if w < width]
+        capped = min(width, self.widths[-1])
+        return widths if capped in widths else widths + [capped]
+
+    def build(self) -> int:
+        """Generate missing variants for every source image; returns how many were processed"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        images = {}
+        for name, source in self.sources().items():
+            try:
+                images[name] = self.process(source)
+            except (OSError, ValueError) as e:
+                logging.error(f"Failed to process project image {source.name}: {e}")
+        self.images = images
+        return len(images)
+
+    def process(self, source: Path) -> Dict[str, Any]:
+        data = source.read_bytes()
+        # Encoder quality is part of the key, so changing it yields new URLs
+        digest = hashlib.sha256(data + f"q{IMAGE_QUALITY}".encode()).hexdigest()[:16]
+        meta_path = self.cache_dir / f"{digest}.json"
+        if meta_path.exists():
+            meta = orjson.loads(meta_path.read_bytes())
+            expected = {(fmt, w) for fmt in self.formats for w in self.variant_widths(meta["width"])}
+            cached = {(variant["format"], variant["width"]) for variant in meta["variants"]}
+            if cached == expected and all(self.path(v["url"].rsplit("/", 1)[1]) for v in meta["variants"]):
+                return meta
+
+        with Image.open(io.BytesIO(data)) as original:
+            original.load()
+            image = original.convert("RGBA" if "A" in original.getbands() else "RGB")
+        width, height = image.size
+        variants = []
+        for fmt in self.formats:
+            for target in self.variant_widths(width):
+                size = (target, max(1, round(height * target / width)))
+                filename = f"{digest}-{target}.{fmt}"
+                if not (self.cache_dir / filename).exists():
+                    resized = image.resize(size, Image.LANCZOS)
+                    if fmt == "jpeg":
+                        resized = resized.convert("RGB")
+                    buffer = io.BytesIO()
+                    resized.save(buffer, fmt.upper(), quality=IMAGE_QUALITY, **IMAGE_SAVE_OPTIONS[fmt])
+                    write_atomic(self.cache_dir / filename, buffer.getvalue())
+                variants.append({"url": f"/api/images/{filename}", "width": size[0], "height": size[1], "format": fmt})
+
+        # A few pixels wide and blurred: enough for a blur-up while the real image loads
+        tiny = image.resize(
+            (IMAGE_PLACEHOLDER_WIDTH, max(1, round(height * IMAGE_PLACEHOLDER_WIDTH / width))), Image.LANCZOS
+        ).filter(ImageFilter.GaussianBlur(1))
+        buffer = io.BytesIO()
+        tiny.save(buffer, "WEBP", quality=30)
+        meta = {
+            "width": width,
+            "height": height,
+            "placeholder": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+            # The most widely supported format at full width, for <img src>
+            "src": variants[-1]["url"],
+            "variants": variants,
+        }
+        write_atomic(meta_path, orjson.dumps(meta))
+        return meta
+
+def supported_image_formats(formats: List[str]) -> List[str]:
+    supported = [fmt for fmt in formats if fmt == "jpeg" or image_features.check(fmt)]
+    for fmt in set(formats) - set(supported):
+        logging.warning(f"Pillow cannot encode {fmt}; skipping those image variants")
+    return supported
+
+image_catalog = ImageCatalog(
+    IMAGE_SOURCE_DIR,
+    IMAGE_CACHE_DIR,
+    IMAGE_WIDTHS,
+    supported_image_formats(IMAGE_FORMATS) if Image is not None else [],
+)
+
+async def build_image_catalog():
+    """Generate image variants off the event loop, then refresh cached portfolios"""
+    try:
+        count = await asyncio.to_thread(image_catalog.build)
+    except OSError as e:
+        logging.error(f"Project images unavailable: {e}")
+        return
+    logging.info(f"Project images ready: {count} sources in {image_catalog.cache_dir}")
+    # Every worker builds its own catalog, so only its own snapshots are stale
+    invalidate_portfolio_cache(broadcast=False)
+
+@api_router.get("/images/{filename}")
+async def get_image(filename: str):
+    """Serve a generated image variant; URLs are content-addressed, so cache forever"""
+    path = image_catalog.path(filename)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return FileResponse(
+        path,
+        media_type=f"image/{path.suffix[1:]}",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+# Live updates
+class EventSubscriber:
+    """One SSE connection: the latest unsent message per section, plus a wakeup"""
+
+    __slots__ = ("pending", "ready")
+
+    def __init__(self):
+        self.pending: Dict[str, bytes] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, section: str, message: bytes):
+        # A newer diff for a section replaces one the client has not read yet,
+        # so a slow client costs at most one message per section
+        self.pending[section] = message
+        self.ready.set()
+
+class PortfolioEventHub:
+    """Fans section-level portfolio changes out to SSE subscribers.
+
+    A single task serves every connection. It wakes when a tenant's cache is
+    invalidated (writes, or the change stream), and without a change stream
+    also polls subscribed tenants every ``EVENTS_POLL_INTERVAL`` seconds.
+    Each changed section is serialized once and shared by all subscribers.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[EventSubscriber]] = {}
+        self.digests: Dict[str, Dict[str, str]] = {}
+        self.change_stream_active = False
+        self._dirty: Set[str] = set()
+        self._all_dirty = False
+        self._wake = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(len(subscribers) for subscribers in self.subscribers.values())
+
+    def subscribe(self, tenant: str) -> EventSubscriber:
+        subscriber = EventSubscriber()
+        self.subscribers.setdefault(tenant, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, tenant: str, subscriber: EventSubscriber):
+        subscribers = self.subscribers.get(tenant)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[tenant]
+            self.digests.pop(tenant, None)
+
+    def notify(self, tenant: Optional[str] = None):
+        if tenant is None:
+            self._all_dirty = True
+        elif tenant in self.subscribers:
+            self._dirty.add(tenant)
+        else:
+            return
+        self._wake.set()
+
+    async def section_digests(self, tenant: str):
+        """Current per-section digests and serialized messages for a tenant"""
+        sources, _ = await fetch_portfolio_sources(FULL_VIEW, tenant)
+        data = build_portfolio_view(sources, FULL_VIEW)
+        digests, messages = {}, {}
+        for section, value in data.items():
+            body = dump_json(value)
+            digest = hashlib.sha256(body).hexdigest()[:32]
+            digests[section] = digest
+            messages[section] = (
+                f"id: {digest}\nevent: section\ndata: ".encode("utf-8")
+                + dump_json({"section": section, "etag": f'"{digest}"', "data": value})
+                + b"\n\n"
+            )
+        return digests, messages
+
+    async def refresh(self, tenant: str):
+        """Push every section whose content changed since the last refresh"""
+        try:
+            digests, messages = await self.section_digests(tenant)
+        except HTTPException:
+            return
+        previous = self.digests.get(tenant)
+        self.digests[tenant] = digests
+        if previous is None:
+            return
+        changed = [section for section, digest in digests.items() if previous.get(section) != digest]
+        if not changed:
+            return
+        if not self.change_stream_active:
+            # Polling found a change nobody announced; drop stale snapshots too
+            portfolio_cache.invalidate(tenant)
+        for subscriber in self.subscribers.get(tenant, ()):
+            for section in changed:
+                subscriber.push(section, messages[section])
+
+    async def run(self):
+        while True:
+            timeout = None if self.change_stream_active else EVENTS_POLL_INTERVAL
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+                # Let a burst of writes settle into one refresh
+                await asyncio.sleep(EVENTS_DEBOUNCE)
+                tenants = set(self.subscribers) if self._all_dirty else self._dirty & set(self.subscribers)
+            except asyncio.TimeoutError:
+                tenants = set(self.subscribers)
+            self._wake.clear()
+            self._dirty.clear()
+            self._all_dirty = False
+            for tenant in tenants:
+                try:
+                    await self.refresh(tenant)
+                except PyMongoError as e:
+                    logging.warning(f"Portfolio event refresh failed for {tenant}: {e}")
+
+event_hub = PortfolioEventHub()
+
+async def stream_portfolio_events(request: Request, tenant: str, subscriber: EventSubscriber):
+    """Yield SSE frames for one subscriber until the client goes away"""
+    try:
+        hello = {"tenant": tenant, "etags": {k: f'"{v}"' for k, v in event_hub.digests[tenant].items()}}
+        yield b"retry: 5000\nevent: hello\ndata: " + dump_json(hello) + b"\n\n"
+        while not await request.is_disconnected():
+            try:
+                await asyncio.wait_for(subscriber.ready.wait(), EVENTS_HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            subscriber.ready.clear()
+            messages, subscriber.pending = subscriber.pending, {}
+            yield b"".join(messages.values())
+    finally:
+        event_hub.unsubscribe(tenant, subscriber)
+
+@api_router.get("/portfolio/events")
+async def portfolio_events(request: Request, tenant: str = DEFAULT_TENANT):
+    """Server-Sent Events stream of section-level portfolio changes"""
+    if tenant != DEFAULT_TENANT:
+        check_tenant_slug(tenant)
+    # Resolved before the response starts, so an unknown tenant still gets a real 404
+    digests = None if tenant in event_hub.digests else (await event_hub.section_digests(tenant))[0]
+    subscriber = event_hub.subscribe(tenant)
+    if digests is not None:
+        event_hub.digests.setdefault(tenant, digests)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(
+        stream_portfolio_events(request, tenant, subscriber),
+        media_type="text/event-stream",
+        headers=headers,
+    )
+
+@api_router.get("/portfolio/{key}")
+async def get_portfolio_section_or_profile(key: str, request: Request, fields: Optional[str] = None):
+    """Get one section of the default portfolio, or a whole portfolio by slug"""
+    if key in PORTFOLIO_SECTIONS:
+        return await serve_portfolio(request, parse_portfolio_fields(fields, key), key)
+    tenant = check_tenant_slug(key)
+    return await serve_portfolio(request, parse_portfolio_fields(fields), tenant=tenant)
+
+@api_router.get("/portfolio/{slug}/{section}")
+async def get_profile_section(slug: str, section: str, request: Request, fields: Optional[str] = None):
+    """Get a single section of the portfolio identified by slug"""
+    tenant = check_tenant_slug(slug)
+    if section not in PORTFOLIO_SECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown portfolio section '{section}'")
+    return await serve_portfolio(request, parse_portfolio_fields(fields, section), section, tenant)
+
+# Search
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:[./-][a-z0-9+#]+)*")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound terms like node.js or ci/cd also yield their parts"""
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        token = match.group()
+        tokens.append(token)
+        if any(sep in token for sep in "./-"):
+            tokens.extend(part for part in re.split(r"[./-]", token) if part)
+    return tokens
+
+class SearchIndex:
+    """In-memory inverted index over project and experience text.
+
+    Postings map a token to per-document weights (term frequency times the
+    field's boost); tech tags have their own exact-match index. Documents can
+    be upserted and removed individually so change events apply in place.
+    """
+
+    # kind -> (title field, {field: boost})
+    KINDS = {
+        "project": ("title", {"title": 3.0, "tech": 2.5, "description": 1.0, "impact": 1.0}),
+        "experience": ("company", {
+            "company": 3.0, "position": 2.0, "description": 1.0, "achievements": 1.0,
+        }),
+    }
+
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.tags: Dict[str, Set[str]] = {}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self.version: Optional[tuple] = None
+        self.built_at = 0.0
+        self.lock = asyncio.Lock()
+
+    def is_current(self) -> bool:
+        if self.version != portfolio_cache.version_of(self.tenant):
+            return False
+        return PORTFOLIO_CACHE_TTL <= 0 or time.monotonic() - self.built_at < PORTFOLIO_CACHE_TTL
+
+    def mark_current(self, version: tuple):
+        self.version = version
+        self.built_at = time.monotonic()
+
+    def clear(self):
+        self.postings.clear()
+        self.tags.clear()
+        self.docs.clear()
+        self._doc_tokens.clear()
+        self._vocabulary = None
+
+    def upsert(self, kind: str, doc: Dict[str, Any]):
+        key = f"{kind}:{doc['id']}"
+        self.remove(key)
+        title_field, boosts = self.KINDS[kind]
+        fields = {}
+        weights: Dict[str, float] = {}
+        for field, boost in boosts.items():
+            value = doc.get(field)
+            if not value:
+                continue
+            text = " · ".join(value) if isinstance(value, list) else str(value)
+            fields[field] = text
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + boost
+        for token, weight in weights.items():
+            self.postings.setdefault(token, {})[key] = weight
+        tech = doc.get("tech", []) if kind == "project" else []
+        for tag in tech:
+            self.tags.setdefault(tag.lower(), set()).add(key)
+        self.docs[key] = {
+            "kind": kind,
+            "id": doc["id"],
+            "title": doc.get(title_field, ""),
+            "tech": tech,
+            "fields": fields,
+        }
+        self._doc_tokens[key] = set(weights)
+        self._vocabulary = None
+
+    def remove(self, key: str):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        for token in self._doc_tokens.pop(key, ()):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self.postings[token]
+        for tag in doc["tech"]:
+            keys = self.tags.get(tag.lower())
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tags[tag.lower()]
+        self._vocabulary = None
+
+    def _expand(self, token: str, prefix: bool) -> List[str]:
+        """The token itself, plus vocabulary entries it prefixes when requested"""
+        if not prefix:
+            return [token] if token in self.postings else []
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, token)
+        matches = []
+        for candidate in self._vocabulary[start:]:
+            if not candidate.startswith(token):
+                break
+            matches.append(candidate)
+        return matches
+
+    def search(self, query: str, tech: List[str], kind: Optional[str], limit: int) -> Dict[str, Any]:
+        terms = list(dict.fromkeys(tokenize(query)))
+        candidates: Optional[Set[str]] = None
+        for tag in tech:
+            keys = self.tags.get(tag.lower(), set())
+            candidates = keys if candidates is None else candidates & keys
+        scores: Dict[str, float] = {}
+        matched: Dict[str, Set[str]] = {}
+        total = len(self.docs) or 1
+        for position, term in enumerate(terms):
+            # The last term is treated as a prefix, for search-as-you-type
+            for token in self._expand(term, prefix=position == len(terms) - 1):
+                posting = self.postings[token]
+                idf = math.log(1 + total / len(posting))
+                for key, weight in posting.items():
+                    scores[key] = scores.get(key, 0.0) + weight * idf
+                    matched.setdefault(key, set()).add(token)
+        if not terms:
+            scores = dict.fromkeys(candidates or (), 1.0)
+        keys = [
+            key for key in scores
+            if (candidates is None or key in candidates)
+            and (kind is None or self.docs[key]["kind"] == kind)
+        ]
+        if terms:
+            # Favour documents that match more of the query terms
+            for key in keys:
+                coverage = len({t for t in terms if any(m.startswith(t) for m in matched[key])})
+                scores[key] *= coverage / len(terms)
+        keys.sort(key=lambda key: scores[key], reverse=True)
+        hits = []
+        for key in keys[:limit]:
+            doc = self.docs[key]
+            hits.append({
+                "kind": doc["kind"],
+                "id": doc["id"],
+                "title": doc["title"],
+                "tech": doc["tech"],
+                "score": round(scores[key], 4),
+                "highlights": highlight(doc["fields"], matched.get(key, set())),
+            })
+        return {"total": len(keys), "hits": hits}
+
+def highlight(fields: Dict[str, str], tokens: Set[str]) -> Dict[str, str]:
+    """Snippets of each matching field with the matched tokens wrapped in <mark>"""
+    if not tokens:
+        return {}
+    pattern = re.compile(
+        "|".join(re.escape(token) for token in sorted(tokens, key=len, reverse=True)),
+        re.IGNORECASE,
+    )
+    highlights = {}
+    for field, text in fields.items():
+        first = pattern.search(text)
+        if first is None:
+            continue
+        start = max(0, first.start() - SEARCH_SNIPPET_CHARS // 3)
+        snippet = text[start:start + SEARCH_SNIPPET_CHARS]
+        marked = []
+        last = 0
+        for match in pattern.finditer(snippet):
+            marked.append(html.escape(snippet[last:match.start()]))
+            marked.append(f"<mark>{html.escape(match.group())}</mark>")
+            last = match.end()
+        marked.append(html.escape(snippet[last:]))
+        prefix = "…" if start > 0 else ""
+        suffix = "…" if start + SEARCH_SNIPPET_CHARS < len(text) else ""
+        highlights[field] = prefix + "".join(marked) + suffix
+    return highlights
+
+# One index per tenant, least recently searched evicted first
+search_indexes: "OrderedDict[str, SearchIndex]" = OrderedDict()
+
+def get_search_index(tenant: str) -> SearchIndex:
+    index = search_indexes.get(tenant)
+    if index is None:
+        index = search_indexes[tenant] = SearchIndex(tenant)
+        while len(search_indexes) > SEARCH_MAX_TENANTS:
+            search_indexes.popitem(last=False)
+    search_indexes.move_to_end(tenant)
+    return index
+
+# Change stream collection -> search index kind
+SEARCH_COLLECTIONS = {"projects": "project", "experiences": "experience"}
+
+def apply_search_change(index: SearchIndex, change: Dict[str, Any]) -> bool:
+    """Apply one change event to a search index; False if it needs a rebuild"""
+    collection = change.get("ns", {}).get("coll")
+    kind = SEARCH_COLLECTIONS.get(collection)
+    if kind is None:
+        return collection in PORTFOLIO_COLLECTIONS
+    operation = change.get("operationType")
+    if operation == "delete":
+        index.remove(f"{kind}:{change['documentKey']['_id']}")
+        return True
+    document = change.get("fullDocument")
+    if operation in ("insert", "update", "replace") and document:
+        index.upsert(kind, dict(document, id=str(document["_id"])))
+        return True
+    return False
+
+async def refresh_search_index(index: SearchIndex):
+    """Rebuild a tenant's search index from the database if it is out of date"""
+    async with index.lock:
+        if index.is_current():
+            return
+        version = portfolio_cache.version_of(index.tenant)
+        match = {"$match": {"tenant": index.tenant}}
+        projects, experiences = await asyncio.gather(
+            timed_query(
+                "projects.aggregate",
+                db.projects.aggregate([match] + PORTFOLIO_PIPELINES["projects"]).to_list(length=None),
+            ),
+            timed_query(
+                "experiences.aggregate",
+                db.experiences.aggregate([match] + PORTFOLIO_PIPELINES["experiences"]).to_list(length=None),
+            ),
+        )
+        index.clear()
+        for project in projects:
+            index.upsert("project", project)
+        for experience in experiences:
+            index.upsert("experience", experience)
+        index.mark_current(version)
+
+@api_router.get("/search")
+async def search(
+    q: str = "",
+    tech: List[str] = Query([]),
+    kind: Optional[str] = Query(None, pattern="^(project|experience)$"),
+    limit: int = Query(10, ge=1, le=SEARCH_MAX_RESULTS),
+    tenant: str = DEFAULT_TENANT,
+):
+    """Ranked full-text and tech-tag search over a tenant's projects and experiences"""
+    # tech may be repeated or comma-separated
+    tags = [tag.strip() for value in tech for tag in value.split(",") if tag.strip()]
+    if not q.strip() and not tags:
+        raise HTTPException(status_code=400, detail="Provide a query (q) or tech filter")
+    if tenant != DEFAULT_TENANT:
+        check_tenant_slug(tenant)
+    index = get_search_index(tenant)
+    if not index.is_current():
+        await refresh_search_index(index)
+    start = time.perf_counter()
+    result = index.search(q, tags, kind, limit)
+    result["query"] = q
+    result["tookMs"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+# Admin routes
+ADMIN_COLLECTIONS = {"experiences": Experience, "projects": Project, "tech_stack": TechStack}
+
+def require_admin(request: Request):
+    """Bearer-token check for the admin API"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Admin API is not configured")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+@functools.lru_cache(maxsize=None)
+def field_adapter(model, name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+def validate_admin_fields(model, fields: Dict[str, Any], partial: bool) -> Dict[str, Any]:
+    """Validate edited fields against the collection's model; derived fields cannot be written"""
+    allowed = stored_fields(model)
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    try:
+        if partial:
+            return {name: field_adapter(model, name).validate_python(value) for name, value in fields.items()}
+        return model(**fields).model_dump(include=set(allowed) | {"createdAt"})
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors(include_url=False))
+
+def document_id(value: Optional[str]) -> ObjectId:
+    if not value or not ObjectId.is_valid(value):
+        raise HTTPException(status_code=400, detail=f"Invalid document id '{value}'")
+    return ObjectId(value)
+
+def versioned_filter(tenant: str, _id: ObjectId, version: int) -> Dict[str, Any]:
+    # Documents written before versioning have no version field and count as 0
+    return {"_id": _id, "tenant": tenant, "version": version if version else {"$in": [0, None]}}
+
+def admin_write_operations(model, batch: AdminBatch):
+    """Translate a batch into bulk_write operations plus the version each touched id must have.
+
+    Every existing document gets at most one write: an order entry for a
+    document that is also updated is folded into that update, so the batch
+    never filters on a version it bumped itself.
+    """
+    operations, inserted = [], []
+    expected: Dict[ObjectId, int] = {}
+    updates: Dict[ObjectId, Dict[str, Any]] = {}
+    deleted = set()
+    for operation in batch.operations:
+        if operation.op == "insert":
+            doc = validate_admin_fields(model, operation.fields, partial=False)
+            _id = ObjectId()
+            operations.append(InsertOne({**doc, "_id": _id, "tenant": batch.tenant, "version": 1}))
+            inserted.append(str(_id))
+            continue
+        _id = document_id(operation.id)
+        if _id in expected:
+            raise HTTPException(status_code=400, detail=f"Document {_id} appears more than once in the batch")
+        expected[_id] = operation.version or 0
+        if operation.op == "delete":
+            deleted.add(_id)
+        else:
+            updates[_id] = validate_admin_fields(model, operation.fields, partial=True)
+    reordered = set()
+    for position, entry in enumerate(batch.order, start=1):
+        _id = document_id(entry.id)
+        if _id in deleted or _id in reordered:
+            raise HTTPException(status_code=400, detail=f"Cannot reorder document {_id}")
+        reordered.add(_id)
+        if _id in updates:
+            if entry.version != expected[_id]:
+                raise HTTPException(
+                    status_code=400, detail=f"Order entry for {_id} names a different version than its update"
+                )
+            updates[_id]["order"] = position
+        else:
+            expected[_id] = entry.version
+            updates[_id] = {"order": position}
+    for _id, version in expected.items():
+        query = versioned_filter(batch.tenant, _id, version)
+        if _id in deleted:
+            operations.append(DeleteOne(query))
+        else:
+            operations.append(UpdateOne(query, {"$set": updates[_id], "$inc": {"version": 1}}))
+    return operations, inserted, expected, deleted
+
+def supports_transactions() -> bool:
+    description = getattr(client, "topology_description", None)
+    return description is not None and description.topology_type_name in ("ReplicaSetWithPrimary", "Sharded")
+
+async def bump_content_version(tenant: str, session=None) -> int:
+    """Increment the tenant's content version, the key downstream caches follow"""
+    meta = await db.portfolio_meta.find_one_and_update(
+        {"_id": f"content:{tenant}"},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+        session=session,
+    )
+    return meta["version"]
+
+async def find_conflicts(collection: str, tenant: str, expected, deleted=None) -> List[Dict[str, Any]]:
+    """Documents whose stored version no longer matches what the client sent.
+
+    Passing ``deleted`` means the batch was partially applied: documents left
+    where this batch's own write would have put them (version + 1, or gone
+    when it deleted them) are not reported.
+    """
+    current = {
+        doc["_id"]: doc.get("version") or 0
+        async for doc in db[collection].find({"_id": {"$in": list(expected)}, "tenant": tenant}, {"version": 1})
+    }
+
+    def conflicting(_id, version: int) -> bool:
+        if deleted is not None and (
+            current.get(_id) == version + 1 or (_id in deleted and _id not in current)
+        ):
+            return False
+        return current.get(_id) != version
+
+    return [
+        {"id": str(_id), "expected": version, "current": current.get(_id)}
+        for _id, version in expected.items()
+        if conflicting(_id, version or 0)
+    ]
+
+class BatchConflict(Exception):
+    pass
+
+@admin_router.get("/{collection}")
+async def admin_list(collection: str, tenant: str = DEFAULT_TENANT):
+    """Documents of a collection with their ids and versions, for editing"""
+    if collection not in ADMIN_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection '{collection}'")
+    pipeline = [{"$match": {"tenant": tenant}}, {"$sort": PORTFOLIO_SORTS[collection]}, {"$project": {
+        "_id": 0, "id": {"$toString": "$_id"}, "version": {"$ifNull": ["$version", 0]},
+        **{name: 1 for name in stored_fields(ADMIN_COLLECTIONS[collection])},
+    }}]
+    docs = await timed_query(f"{collection}.aggregate", db[collection].aggregate(pipeline).to_list(None))
+    return FastJSONResponse(docs)
+
+@admin_router.post("/{collection}/batch")
+async def admin_batch(collection: str, batch: AdminBatch):
+    """Apply edits, inserts, deletes and a reorder in one bulk write.
+
+    Every update and delete names the version it was based on. Versions are
+    checked before anything is written, so a stale batch answers 409 with
+    the conflicting documents and changes nothing. A write that races in
+    between the check and the bulk write rolls the batch back on replica
+    sets; on a standalone server the operations before it stay applied.
+    """
+    if collection not in ADMIN_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection '{collection}'")
+    if batch.tenant != DEFAULT_TENANT:
+        check_tenant_slug(batch.tenant)
+    operations, inserted, expected, deleted = admin_write_operations(ADMIN_COLLECTIONS[collection], batch)
+    if not operations:
+        raise HTTPException(status_code=400, detail="Empty batch")
+    if len(operations) > ADMIN_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {ADMIN_BATCH_MAX} operations per batch")
+
+    def conflict_response(conflicts, applied: bool) -> HTTPException:
+        return HTTPException(status_code=409, detail={
+            "message": "Documents were changed by someone else",
+            "conflicts": conflicts,
+            "applied": applied,
+        })
+
+    conflicts = await find_conflicts(collection, batch.tenant, expected)
+    if conflicts:
+        raise conflict_response(conflicts, applied=False)
+
+    async def apply(session=None):
+        result = await db[collection].bulk_write(operations, ordered=True, session=session)
+        if result.matched_count + result.deleted_count < len(expected):
+            raise BatchConflict(result)
+        return result, await bump_content_version(batch.tenant, session)
+
+    try:
+        if supports_transactions():
+            async with await client.start_session() as session:
+                async with session.start_transaction():
+                    result, content_version = await apply(session)
+        else:
+            result, content_version = await apply()
+    except BatchConflict as conflict:
+        result = conflict.args[0]
+        applied = not supports_transactions() and bool(
+            result.inserted_count + result.modified_count + result.deleted_count
+        )
+        if applied:
+            # Part of the batch landed, so caches must still move on
+            await bump_content_version(batch.tenant)
+            invalidate_portfolio_cache(batch.tenant)
+        raise conflict_response(
+            await find_conflicts(collection, batch.tenant, expected, deleted if applied else None), applied
+        )
+    except BulkWriteError as e:
+        raise HTTPException(status_code=400, detail=e.details.get("writeErrors", []))
+
+    invalidate_portfolio_cache(batch.tenant)
+    logging.info(
+        f"Admin batch on {batch.tenant}/{collection}: {len(inserted)} inserted, "
+        f"{result.modified_count} modified, {result.deleted_count} deleted"
+    )
+    return {
+        "inserted": inserted,
+        "modified": result.modified_count,
+        "deleted": result.deleted_count,
+        "contentVersion": content_version,
+    }
+
 # Legacy routes for backward compatibility
 @api_router.get("/")
 async def root():
-    return {"message": "Portfolio API Ready"}
+    health = await database_health()
+    if health["status"] != "ok":
+        return FastJSONResponse({"message": "Database unavailable", "database": health}, status_code=503)
+    return {"message": "Portfolio API Ready", "database": health}
+
+async def store_status_checks(docs: List[Dict[str, Any]]) -> int:
+    """Insert a batch of status checks, returning how many were written"""
+    if not docs:
+        return 0
+    try:
+        result = await timed_query(
+            "status_checks.insert_many", db.status_checks.insert_many(docs, ordered=False)
+        )
+        written = docs
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        logging.error(f"Status check batch partially failed: {errors[:1]}")
+        failed = {error["index"] for error in errors}
+        written = [doc for index, doc in enumerate(docs) if index not in failed]
+    await record_status_rollups(written)
+    return len(written)
+
+def naive_utc(timestamp: datetime) -> datetime:
+    # Timestamps are stored as naive UTC, so aware query bounds are converted to match
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def truncate_timestamp(timestamp: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(second=0, microsecond=0)
+
+def rollup_counts(docs, counts: Optional[Dict[tuple, int]] = None) -> Dict[tuple, int]:
+    counts = {} if counts is None else counts
+    for doc in docs:
+        for granularity in STATUS_ROLLUP_GRANULARITIES:
+            key = (granularity, doc["client_name"], truncate_timestamp(doc["timestamp"], granularity))
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+def rollup_operations(counts: Dict[tuple, int], operator: str = "$inc") -> List[UpdateOne]:
+    """One upsert per (granularity, client, bucket), applying ``operator`` to the count"""
+    operations = []
+    for (granularity, client_name, bucket), count in counts.items():
+        update: Dict[str, Any] = {operator: {"count": count}}
+        retention = STATUS_ROLLUP_RETENTION_DAYS[granularity]
+        if retention:
+            update["$setOnInsert"] = {"expiresAt": bucket + timedelta(days=retention)}
+        operations.append(UpdateOne(
+            {"granularity": granularity, "client_name": client_name, "bucket": bucket},
+            update,
+            upsert=True,
+        ))
+    return operations
+
+async def record_status_rollups(docs: List[Dict[str, Any]]):
+    """Add stored status checks to their rollup buckets.
+
+    Raw checks are already written, so a failure here is logged rather than
+    surfaced; it leaves the affected buckets short, not the raw history.
+    """
+    if not docs:
+        return
+    try:
+        await timed_query(
+            "status_rollups.bulk_write",
+            db.status_rollups.bulk_write(rollup_operations(rollup_counts(docs)), ordered=False),
+        )
+    except PyMongoError as e:
+        logging.error(f"Failed to update status rollups for {len(docs)} checks: {e}")
+
+async def backfill_status_rollups(before: datetime, batch_size: int = 1000) -> int:
+    """Rebuild rollup buckets from raw status checks stored before ``before``.
 
-@api_router.post("/status", response_model=StatusCheck)
+    Counts are applied with $max, so rerunning is harmless and buckets
+    already kept by ingest are never lowered, even where raw checks have
+    since expired. Minute buckets past their retention are skipped.
+    """
+    cursor = db.status_checks.find(
+        {"timestamp": {"$lt": before}}, {"_id": 0, "client_name": 1, "timestamp": 1}
+    ).batch_size(batch_size)
+    counts: Dict[tuple, int] = {}
+    while batch := await cursor.to_list(batch_size):
+        rollup_counts(batch, counts)
+    now = datetime.utcnow()
+
+    def retained(granularity: str, bucket: datetime) -> bool:
+        retention = STATUS_ROLLUP_RETENTION_DAYS[granularity]
+        return not retention or bucket + timedelta(days=retention) > now
+
+    operations = rollup_operations(
+        {key: count for key, count in counts.items() if retained(key[0], key[2])}, "$max"
+    )
+    for start in range(0, len(operations), batch_size):
+        await db.status_rollups.bulk_write(operations[start:start + batch_size], ordered=False)
+    return len(operations)
+
+class StatusWriteBuffer:
+    """Write-behind buffer that batches single status check inserts.
+
+    Pending documents are flushed with one ``insert_many`` when ``max_size``
+    is reached or every ``flush_interval`` seconds, and drained on shutdown.
+    """
+
+    def __init__(self, max_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._pending: List[Dict[str, Any]] = []
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        self.last_flush_ms = 0.0
+        self.last_flush_size = 0
+        self.flushed = 0
+        self.failed = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def has_room(self) -> bool:
+        # Past this depth callers write directly, so a slow database applies back-pressure
+        return self._task is not None and not self._closing and self.depth < self.max_size * 10
+
+    def add(self, doc: Dict[str, Any]):
+        self._pending.append(doc)
+        if len(self._pending) >= self.max_size:
+            self._wake.set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        while self._pending:
+            batch, self._pending = self._pending[:self.max_size], self._pending[self.max_size:]
+            start = time.perf_counter()
+            try:
+                written = await store_status_checks(batch)
+            except PyMongoError as e:
+                logging.error(f"Status check flush failed: {e}")
+                written = 0
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self.last_flush_size = len(batch)
+            self.flushed += written
+            self.failed += len(batch) - written
+            logging.debug(
+                f"Flushed {len(batch)} status checks in {self.last_flush_ms:.1f}ms "
+                f"(queue depth {self.depth})"
+            )
+            if self.last_flush_ms > self.flush_interval * 1000:
+                logging.warning(
+                    f"Status check flush took {self.last_flush_ms:.1f}ms, "
+                    f"longer than the {self.flush_interval}s flush interval"
+                )
+
+    async def close(self):
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.depth,
+            "last_flush_ms": self.last_flush_ms,
+            "last_flush_size": self.last_flush_size,
+            "flushed": self.flushed,
+            "failed": self.failed,
+        }
+
+status_buffer = StatusWriteBuffer(STATUS_BUFFER_MAX_SIZE, STATUS_BUFFER_FLUSH_INTERVAL)
+
+@api_router.post("/status", response_model=StatusCheck, dependencies=[Depends(mongo_admission)])
 async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
+    check_status_rate([input.client_name])
+    status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
-    return status_obj
+    if STATUS_WRITE_BUFFER and status_buffer.has_room():
+        status_buffer.add(status_obj.model_dump())
+    else:
+        doc = status_obj.model_dump()
+        _ = await timed_query("status_checks.insert_one", db.status_checks.insert_one(doc))
+        await record_status_rollups([doc])
+    return FastJSONResponse(status_obj)
+
+@api_router.post("/status/bulk", response_model=List[StatusCheck], dependencies=[Depends(mongo_admission)])
+async def create_status_checks(inputs: List[StatusCheckCreate]):
+    """Create many status checks with a single unordered insert_many"""
+    if len(inputs) > STATUS_BULK_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {STATUS_BULK_MAX} status checks per request",
+        )
+    check_status_rate([item.client_name for item in inputs])
+    status_objs = [StatusCheck(**item.model_dump()) for item in inputs]
+    written = await store_status_checks([obj.model_dump() for obj in status_objs])
+    if written < len(status_objs):
+        raise HTTPException(
+            status_code=500,
+            detail=f"Only {written} of {len(status_objs)} status checks were stored",
+        )
+    return FastJSONResponse(status_objs)
+
+def encode_status_cursor(doc: Dict[str, Any]) -> str:
+    """Encode the sort key of the last returned status check"""
+    raw = f"{doc['timestamp'].isoformat()}|{doc['id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_status_cursor(cursor: str):
+    """Decode a cursor produced by encode_status_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp, status_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), status_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def build_status_query(
+    client_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Build the Mongo filter shared by the status check read endpoints"""
+    query: Dict[str, Any] = {}
+    if client_name is not None:
+        query["client_name"] = client_name
+    if since is not None or until is not None:
+        query["timestamp"] = {}
+        if since is not None:
+            query["timestamp"]["$gte"] = since
+        if until is not None:
+            query["timestamp"]["$lt"] = until
+    return query
+
+@api_router.get("/status", response_model=List[StatusCheck], dependencies=[Depends(mongo_admission)])
+async def get_status_checks(
+    request: Request,
+    limit: int = Query(STATUS_PAGE_DEFAULT, ge=1, le=STATUS_PAGE_MAX),
+    cursor: Optional[str] = None,
+    client_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """List status checks newest first, paginated by an opaque keyset cursor"""
+    query = build_status_query(client_name, since, until)
+    if cursor:
+        timestamp, status_id = decode_status_cursor(cursor)
+        after = {"$or": [
+            {"timestamp": {"$lt": timestamp}},
+            {"timestamp": timestamp, "id": {"$lt": status_id}},
+        ]}
+        query = {"$and": [query, after]} if query else after
+    
+    # Fetch one extra row to learn whether another page exists
+    status_checks = await timed_query(
+        "status_checks.find",
+        db.status_checks.find(query, {"_id": 0})
+        .sort([("timestamp", -1), ("id", -1)])
+        .limit(limit + 1)
+        .to_list(limit + 1),
+    )
+    headers = {}
+    if len(status_checks) > limit:
+        status_checks = status_checks[:limit]
+        next_cursor = encode_status_cursor(status_checks[-1])
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    # Rows come from our own collection with a fixed projection, so they are
+    # serialized as-is rather than rebuilt as StatusCheck models
+    if STRICT_READ_MODELS:
+        status_checks = [StatusCheck.model_validate(doc) for doc in status_checks]
+    return FastJSONResponse(status_checks, headers=headers)
+
+async def stream_status_ndjson(cursor):
+    """Yield status checks as newline-delimited JSON, one batch per chunk"""
+    lines = []
+    async with mongo_gate.admit():
+        async for doc in cursor:
+            lines.append(dump_json(doc))
+            if len(lines) >= STATUS_EXPORT_BATCH_SIZE:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
 
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+async def stream_status_csv(cursor):
+    """Yield status checks as CSV, one batch per chunk"""
+    fields = ["id", "client_name", "timestamp"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    rows = 0
+    async with mongo_gate.admit():
+        async for doc in cursor:
+            writer.writerow([
+                doc["timestamp"].isoformat() if field == "timestamp" else doc.get(field, "")
+                for field in fields
+            ])
+            rows += 1
+            if rows >= STATUS_EXPORT_BATCH_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+@api_router.get("/status/export")
+async def export_status_checks(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    client_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Stream the full status check history oldest first as NDJSON or CSV.
+
+    The Mongo slot is held by the stream itself, which outlives this handler;
+    a full gate still sheds here, before any headers go out.
+    """
+    mongo_gate.check()
+    query = build_status_query(client_name, since, until)
+    cursor = (
+        db.status_checks.find(query, {"_id": 0})
+        .sort([("timestamp", 1), ("id", 1)])
+        .batch_size(STATUS_EXPORT_BATCH_SIZE)
+    )
+    if format == "csv":
+        body, media_type = stream_status_csv(cursor), "text/csv"
+    else:
+        body, media_type = stream_status_ndjson(cursor), "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="status_checks.{format}"'}
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
+@api_router.get("/status/stats", dependencies=[Depends(mongo_admission)])
+async def get_status_stats(
+    granularity: str = Query("minute", pattern="^(minute|hour)$"),
+    client_name: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """Status check counts per time bucket, read from the rollups.
+
+    Defaults to the last day. Without client_name the series sums every
+    client and the busiest clients over the range are listed as well.
+    """
+    until = naive_utc(until) if until else datetime.utcnow()
+    since = naive_utc(since) if since else until - timedelta(days=1)
+    step = STATUS_ROLLUP_GRANULARITIES[granularity]
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be earlier than until")
+    if (until - since) / step > STATUS_STATS_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range spans more than {STATUS_STATS_MAX_BUCKETS} {granularity} buckets",
+        )
+
+    match: Dict[str, Any] = {
+        "granularity": granularity,
+        "bucket": {"$gte": truncate_timestamp(since, granularity), "$lt": until},
+    }
+    if client_name is not None:
+        match["client_name"] = client_name
+    series_pipeline = [
+        {"$match": match},
+        {"$group": {"_id": "$bucket", "count": {"$sum": "$count"}}},
+        {"$sort": {"_id": 1}},
+        {"$project": {"_id": 0, "bucket": "$_id", "count": 1}},
+    ]
+    queries = [timed_query("status_rollups.aggregate", db.status_rollups.aggregate(series_pipeline).to_list(None))]
+    if client_name is None:
+        clients_pipeline = [
+            {"$match": match},
+            {"$group": {"_id": "$client_name", "count": {"$sum": "$count"}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": STATUS_STATS_TOP_CLIENTS},
+            {"$project": {"_id": 0, "client_name": "$_id", "count": 1}},
+        ]
+        queries.append(timed_query(
+            "status_rollups.aggregate", db.status_rollups.aggregate(clients_pipeline).to_list(None)
+        ))
+    results = await asyncio.gather(*queries)
+    series = results[0]
+    return FastJSONResponse({
+        "granularity": granularity,
+        "since": since,
+        "until": until,
+        "total": sum(point["count"] for point in series),
+        "series": series,
+        "topClients": results[1] if client_name is None else None,
+    })
 
 # Include the router in the main app
+api_router.include_router(admin_router)
 app.include_router(api_router)
 
 app.add_middleware(
@@ -423,6 +2994,180 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+register_metric(Gauge(
+    "portfolio_cache_entries",
+    "Portfolio snapshots held in memory across all tenants",
+    lambda: len(portfolio_cache),
+))
+register_metric(Gauge(
+    "portfolio_cache_bytes",
+    "Encoded bytes held by cached portfolio snapshots",
+    lambda: portfolio_cache.nbytes,
+))
+register_metric(Gauge(
+    "portfolio_event_subscribers",
+    "Open portfolio SSE connections",
+    lambda: len(event_hub),
+))
+register_metric(Gauge(
+    "status_buffer_queue_depth",
+    "Status checks waiting in the write-behind buffer",
+    lambda: status_buffer.depth,
+))
+register_metric(Gauge(
+    "status_buffer_last_flush_seconds",
+    "Duration of the most recent write-behind buffer flush",
+    lambda: status_buffer.last_flush_ms / 1000,
+))
+
+register_metric(Gauge(
+    "mongo_requests_in_flight",
+    "Requests holding a Mongo concurrency slot",
+    lambda: mongo_gate.in_flight,
+))
+register_metric(Gauge(
+    "status_rate_limit_clients",
+    "Clients with a tracked token bucket",
+    lambda: len(status_rate_limiter),
+))
+register_metric(Gauge(
+    "mongo_pool_connections",
+    "Open connections in the Motor pool, across servers",
+    lambda: pool_monitor.total("connections"),
+))
+register_metric(Gauge(
+    "mongo_pool_checked_out",
+    "Pool connections currently checked out",
+    lambda: pool_monitor.total("checkedOut"),
+))
+register_metric(Gauge(
+    "mongo_pool_waiting",
+    "Operations waiting for a pool connection",
+    lambda: pool_monitor.total("waiting"),
+))
+
+# Health checks
+health_state: Dict[str, Any] = {"checked_at": 0.0, "result": None}
+
+async def ping_database() -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), HEALTH_PING_TIMEOUT)
+    except asyncio.TimeoutError:
+        return {"status": "unavailable", "error": f"ping timed out after {HEALTH_PING_TIMEOUT}s"}
+    except PyMongoError as e:
+        return {"status": "unavailable", "error": str(e)}
+    return {"status": "ok", "pingMs": round((time.perf_counter() - start) * 1000, 2)}
+
+async def database_health() -> Dict[str, Any]:
+    """Ping result and pool occupancy, reused for HEALTH_CACHE_SECONDS so probes stay cheap"""
+    now = time.monotonic()
+    if health_state["result"] is None or now - health_state["checked_at"] >= HEALTH_CACHE_SECONDS:
+        health_state["result"] = await ping_database()
+        health_state["checked_at"] = time.monotonic()
+    max_pool_size = mongo_options.get("maxPoolSize", 100)
+    servers = pool_monitor.snapshot()
+    saturation = max((s["checkedOut"] / max_pool_size for s in servers.values()), default=0.0)
+    return {
+        **health_state["result"],
+        "pool": {
+            "maxPoolSize": max_pool_size,
+            "saturation": round(saturation, 3),
+            "servers": servers,
+        },
+    }
+
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the process answers; database state is reported, not enforced"""
+    return {"status": "ok", "database": await database_health()}
+
+@app.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: 503 while Mongo is unreachable or the pool is saturated with waiters"""
+    health = await database_health()
+    pool = health["pool"]
+    waiting = sum(server["waiting"] for server in pool["servers"].values())
+    if health["status"] != "ok":
+        return FastJSONResponse({"status": "unavailable", "database": health}, status_code=503)
+    if pool["saturation"] >= POOL_SATURATION_THRESHOLD and waiting:
+        return FastJSONResponse({"status": "saturated", "database": health}, status_code=503)
+    return {"status": "ok", "database": health}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose metrics in the Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# SPA shell
+class SpaShell:
+    """The built index.html, split around </head> and re-read when the file changes"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.mtime: Optional[int] = None
+        self.head = b""
+        self.tail = b""
+
+    def load(self) -> Optional[int]:
+        """Current template version (its mtime), or None when there is no build"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self.mtime:
+            head, separator, tail = self.path.read_bytes().partition(b"</head>")
+            if not separator:
+                head, tail = b"", head
+            self.head, self.tail, self.mtime = head, separator + tail, mtime
+        return mtime
+
+    def render(self, data: Optional[PayloadSnapshot]) -> bytes:
+        if data is None:
+            return self.head + self.tail
+        # "<" is escaped so no string in the data can close the script element
+        script = (
+            b'<script id="portfolio-data" type="application/json" data-version="'
+            + data.digest.encode("ascii") + b'">'
+            + data.body.replace(b"<", b"\\u003c")
+            + b"</script>"
+        )
+        return self.head + script + self.tail
+
+spa_shell = SpaShell(SPA_BUILD_DIR / "index.html")
+
+async def build_spa_shell(data: PayloadSnapshot) -> PayloadSnapshot:
+    return await asyncio.to_thread(PayloadSnapshot.from_body, spa_shell.render(data))
+
+@app.get("/", include_in_schema=False)
+async def spa_index(request: Request):
+    """The SPA shell with the current portfolio embedded, so first paint needs no API call.
+
+    Rendered shells are cached per portfolio digest and template version, so
+    a content change or a new frontend build yields a new page and ETag.
+    """
+    template = spa_shell.load()
+    if template is None:
+        raise HTTPException(status_code=404, detail="Frontend build not found")
+    try:
+        data = await get_portfolio_snapshot()
+    except Exception as e:
+        # The page can still fetch /api/portfolio itself
+        logging.warning(f"Serving the SPA shell without embedded portfolio data: {e}")
+        return Response(spa_shell.render(None), media_type="text/html; charset=utf-8")
+    shell = await portfolio_cache.get(
+        lambda: build_spa_shell(data), DEFAULT_TENANT, f"spa-shell:{data.digest}:{template}"
+    )
+    return snapshot_response(request, shell, media_type="text/html; charset=utf-8")
+
+# Everything else in the build (bundles, images) is served as-is; mounted
+# last so it never shadows the API
+if SPA_BUILD_DIR.is_dir():
+    app.mount("/", StaticFiles(directory=SPA_BUILD_DIR), name="spa")
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -430,11 +3175,175 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def ensure_indexes():
+    """Apply the INDEXES registry; creating an existing index is a no-op"""
+    for collection, indexes in INDEXES.items():
+        try:
+            await db[collection].create_indexes(indexes)
+        except OperationFailure as e:
+            # IndexOptionsConflict / IndexKeySpecsConflict: an index with this
+            # name exists with different options, e.g. a changed TTL
+            if e.code not in (85, 86):
+                raise
+            for index in indexes:
+                await update_index_options(collection, index)
+
+async def update_index_options(collection: str, index: IndexModel):
+    """Bring an existing index's TTL in line with the registry via collMod"""
+    document = index.document
+    if "expireAfterSeconds" not in document:
+        return
+    await db.command(
+        "collMod",
+        collection,
+        index={"name": document["name"], "expireAfterSeconds": document["expireAfterSeconds"]},
+    )
+    logging.info(f"Updated TTL of {collection}.{document['name']} to {document['expireAfterSeconds']}s")
+
+def plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flatten the stage names of an explain plan tree"""
+    stages = [plan.get("stage", "")]
+    if "inputStage" in plan:
+        stages += plan_stages(plan["inputStage"])
+    for child in plan.get("inputStages", []):
+        stages += plan_stages(child)
+    return stages
+
+async def check_index_usage() -> List[Dict[str, Any]]:
+    """Explain every registered query and report those not served by an index"""
+    reports = []
+    for name, collection, query, sort in INDEXED_QUERIES:
+        explain = await db.command(
+            "explain",
+            {"find": collection, "filter": query, "sort": sort},
+            verbosity="queryPlanner",
+        )
+        winning = explain["queryPlanner"]["winningPlan"]
+        stages = plan_stages(winning.get("queryPlan", winning))
+        problems = [stage for stage in ("COLLSCAN", "SORT") if stage in stages]
+        reports.append({"query": name, "collection": collection, "stages": stages, "problems": problems})
+        if problems:
+            logging.warning(f"Query {name} on {collection} is not index-backed: {' -> '.join(stages)}")
+    return reports
+
+background_tasks: List[asyncio.Task] = []
+
 @app.on_event("startup")
 async def startup_db():
+    connect_database()
+    if invalidation_bus is not None:
+        await invalidation_bus.start()
+    if metrics_share is not None:
+        background_tasks.append(asyncio.create_task(metrics_share.run()))
+    # Seeding migrates legacy documents, which must happen before unique indexes are built
     await init_portfolio_data()
     logging.info("Portfolio data initialized")
+    await ensure_indexes()
+    await refresh_search_index(get_search_index(DEFAULT_TENANT))
+    if INDEX_CHECK:
+        await check_index_usage()
+    if PORTFOLIO_CHANGE_STREAM:
+        background_tasks.append(asyncio.create_task(watch_portfolio_changes()))
+    background_tasks.append(asyncio.create_task(event_hub.run()))
+    if IMAGES_ENABLED and image_catalog.formats:
+        background_tasks.append(asyncio.create_task(build_image_catalog()))
+    if STATUS_WRITE_BUFFER:
+        status_buffer.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    for task in background_tasks:
+        task.cancel()
+    await status_buffer.close()
+    if invalidation_bus is not None:
+        invalidation_bus.close()
+    if metrics_share is not None:
+        metrics_share.close()
+    close_database()
+
+# Command line
+cli = typer.Typer(help="Portfolio API")
+
+@cli.callback()
+def main():
+    """Portfolio API management commands"""
+
+@cli.command()
+def snapshot(
+    out: Path = typer.Option(Path(PORTFOLIO_SNAPSHOT_DIR or "snapshots"), help="Snapshot directory"),
+    tenant: List[str] = typer.Option([DEFAULT_TENANT], help="Tenant slug; repeat for several"),
+):
+    """Write content-hashed static JSON snapshots of the assembled portfolio"""
+    async def run():
+        connect_database()
+        try:
+            # Snapshots embed image variants, which only exist once the catalog is built
+            if IMAGES_ENABLED and image_catalog.formats:
+                await build_image_catalog()
+            for slug in tenant:
+                manifest = await write_portfolio_snapshot(out, slug)
+                typer.echo(f"{slug}: {manifest['version']} -> {out / slug / 'manifest.json'}")
+        finally:
+            close_database()
+
+    asyncio.run(run())
+
+@cli.command()
+def backfill_rollups(
+    before: Optional[datetime] = typer.Option(
+        None, help="Only count checks before this UTC time; defaults to the start of the current hour"
+    ),
+):
+    """Build status rollups for checks stored before rollups existed"""
+    async def run():
+        connect_database()
+        try:
+            cutoff = naive_utc(before) if before else truncate_timestamp(datetime.utcnow(), "hour")
+            written = await backfill_status_rollups(cutoff)
+            typer.echo(f"Backfilled {written} rollup buckets from checks before {cutoff.isoformat()}")
+        finally:
+            close_database()
+
+    asyncio.run(run())
+
+@cli.command()
+def serve(
+    host: str = typer.Option(os.environ.get('HOST', '0.0.0.0')),
+    port: int = typer.Option(int(os.environ.get('PORT', '8001'))),
+    workers: int = typer.Option(int(os.environ.get('WEB_CONCURRENCY', '1')), help="Worker processes"),
+    reload: bool = typer.Option(False, help="Restart on code changes (single worker)"),
+):
+    """Run the API under uvicorn, optionally as several worker processes.
+
+    Workers share cache invalidations and metrics through the bus directory,
+    but load-shedding limits stay per worker, so the deployment as a whole
+    admits up to ``workers`` times each configured limit.
+    """
+    bus_dir = None
+    if workers > 1 and not os.environ.get('PORTFOLIO_BUS_DIR'):
+        # Workers are spawned and re-import this module, picking the directory up from the environment
+        bus_dir = tempfile.mkdtemp(prefix="portfolio-bus-")
+        os.environ['PORTFOLIO_BUS_DIR'] = bus_dir
+    limits = []
+    if STATUS_RATE_LIMIT:
+        limits.append(f"{STATUS_RATE_LIMIT * workers:g} status checks/s per client")
+    if MONGO_CONCURRENCY_LIMIT:
+        limits.append(f"{MONGO_CONCURRENCY_LIMIT * workers} concurrent Mongo-bound requests")
+    if workers > 1 and not reload and limits:
+        logging.info(f"Load-shedding limits apply per worker; {workers} workers admit up to {' and '.join(limits)}")
+    try:
+        uvicorn.run(
+            "server:app",
+            app_dir=str(ROOT_DIR),
+            host=host,
+            port=port,
+            workers=None if reload else workers,
+            reload=reload,
+            proxy_headers=True,
+        )
+    finally:
+        if bus_dir:
+            shutil.rmtree(bus_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    cli()
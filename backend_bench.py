@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Portfolio Backend Benchmark Suite
+Drives the API in-process at a fixed concurrency and reports throughput
+and latency percentiles, optionally comparing against a saved baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent / "backend"
+
+# Scenario name -> (method, path, json body)
+SCENARIOS = {
+    "portfolio": ("GET", "/api/portfolio", None),
+    "status_list": ("GET", "/api/status?limit=1000", None),
+    "status_create": ("POST", "/api/status", {"client_name": "bench"}),
+}
+
+
+def load_app(mongo_url: str, db_name: str):
+    """Import the FastAPI app, backed by mongomock unless a URL is given"""
+    os.environ["MONGO_URL"] = mongo_url or "mongodb://localhost:27017"
+    os.environ["DB_NAME"] = db_name
+    # The benchmark hammers one client_name on purpose; measure the API, not the limiter
+    os.environ.setdefault("STATUS_RATE_LIMIT", "0")
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    if not mongo_url:
+        from mongomock_motor import AsyncMongoMockClient
+
+        # The app connects in its startup hook, so swap the client factory
+        server.create_mongo_client = AsyncMongoMockClient
+    return server
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Issue `requests` calls from `concurrency` workers and summarize latency"""
+    method, path, body = SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p90_ms": percentile(latencies, 90),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+async def seed_status_checks(server, count: int):
+    """Fill status_checks so the list scenario reads a realistic page"""
+    existing = await server.db.status_checks.count_documents({})
+    docs = [
+        server.StatusCheck(client_name=f"client-{i % 50}").model_dump()
+        for i in range(max(0, count - existing))
+    ]
+    if docs:
+        await server.db.status_checks.insert_many(docs)
+
+
+async def run_benchmarks(args) -> Dict[str, Any]:
+    server = load_app(args.mongo_url, args.db_name)
+    await server.app.router.startup()
+    try:
+        await seed_status_checks(server, args.status_docs)
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results = {}
+            for name in args.scenarios:
+                await run_scenario(client, name, args.warmup, args.concurrency)
+                results[name] = await run_scenario(client, name, args.requests, args.concurrency)
+                print_result(name, results[name])
+        transform = None
+        if args.transform_docs:
+            if not args.mongo_url:
+                print("transform: mongomock runs pipelines in Python; pass --mongo-url for real numbers")
+            transform = await run_transform_benchmark(server, args.transform_docs, args.transform_rounds)
+        read_path = None
+        if args.read_rows:
+            read_path = await run_read_path_benchmark(server, args.read_rows, args.read_rounds)
+    finally:
+        await server.app.router.shutdown()
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "backend": "mongodb" if args.mongo_url else "mongomock",
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "status_docs": args.status_docs,
+        },
+        "results": results,
+        "transform": transform,
+        "read_path": read_path,
+    }
+
+
+def legacy_serialize_doc(doc):
+    """The per-document _id rewrite get_portfolio used before the read pipelines"""
+    if doc and '_id' in doc:
+        doc['id'] = str(doc['_id'])
+        del doc['_id']
+    return doc
+
+
+def legacy_group_tech(tech_raw):
+    """The fixed-category if/elif grouping get_portfolio used before group_tech_stack"""
+    tech_stack = {}
+    for tech in tech_raw:
+        category = tech["category"]
+        if category == "frontend":
+            tech_stack["frontend"] = tech["technologies"]
+        elif category == "performance":
+            tech_stack["performance"] = tech["technologies"]
+        elif category == "backend":
+            tech_stack["backend"] = tech["technologies"]
+        elif category == "cloud":
+            tech_stack["cloud"] = tech["technologies"]
+        elif category == "tools":
+            tech_stack["tools"] = tech["technologies"]
+        elif category == "methodologies":
+            tech_stack["methodologies"] = tech["technologies"]
+    return tech_stack
+
+
+async def measure(fn, rounds: int, setup=None) -> Dict[str, float]:
+    """Mean wall and CPU time, and peak traced allocation, of an async callable"""
+    elapsed = 0.0
+    cpu = 0.0
+    peak = 0
+    for _ in range(rounds):
+        state = setup() if setup else None
+        tracemalloc.start()
+        start, cpu_start = time.perf_counter(), time.process_time()
+        await fn(state)
+        elapsed += time.perf_counter() - start
+        cpu += time.process_time() - cpu_start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"mean_ms": elapsed / rounds * 1000, "cpu_ms": cpu / rounds * 1000, "peak_kib": peak / 1024}
+
+
+def synthetic_experiences(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "company": f"Company {i}",
+            "position": "Engineer",
+            "duration": "2020 - 2024",
+            "description": "Synthetic experience for benchmarking",
+            "achievements": [f"Achievement {j}" for j in range(5)],
+            "order": i,
+            "createdAt": datetime.utcnow(),
+        }
+        for i in range(count)
+    ]
+
+
+def synthetic_tech_stack(count: int) -> List[Dict[str, Any]]:
+    categories = ["frontend", "performance", "backend", "cloud", "tools", "methodologies"]
+    return [
+        {
+            "category": categories[i] if i < len(categories) else f"category-{i}",
+            "technologies": ["A", "B", "C"],
+            "order": i,
+        }
+        for i in range(count)
+    ]
+
+
+async def run_transform_benchmark(server, docs: int, rounds: int) -> Dict[str, Any]:
+    """Compare the legacy find + Python transform with the Mongo read pipelines.
+
+    Both sides include the database round trip, since the pipelines move the
+    per-document work into Mongo's $project rather than removing it. Only
+    representative with --mongo-url; mongomock evaluates pipelines in Python.
+    """
+    experiences = server.db.bench_experiences
+    tech_stack = server.db.bench_tech_stack
+    await experiences.drop()
+    await tech_stack.drop()
+    await experiences.insert_many(synthetic_experiences(docs))
+    await tech_stack.insert_many(synthetic_tech_stack(docs))
+    pipeline = server.document_pipeline({"order": 1}, server.stored_fields(server.Experience))
+
+    async def legacy_query(_):
+        raw = await experiences.find({}, {"createdAt": 0}).sort("order", 1).to_list(None)
+        [legacy_serialize_doc(doc) for doc in raw]
+        legacy_group_tech(await tech_stack.find().sort("order", 1).to_list(None))
+
+    async def pipeline_query(_):
+        await experiences.aggregate(pipeline).to_list(None)
+        server.group_tech_stack(
+            await tech_stack.aggregate(server.PORTFOLIO_PIPELINES["tech_stack"]).to_list(None)
+        )
+
+    results = {
+        "docs": docs,
+        "legacy_query": await measure(legacy_query, rounds),
+        "pipeline_query": await measure(pipeline_query, rounds),
+    }
+    await experiences.drop()
+    await tech_stack.drop()
+    for name in ("legacy_query", "pipeline_query"):
+        print(f"transform/{name:<16} {results[name]['mean_ms']:>9.2f}ms  peak {results[name]['peak_kib']:>9.1f}KiB")
+    return results
+
+
+def synthetic_status_rows(count: int) -> List[Dict[str, Any]]:
+    """Rows as the status list reads them: the stored fields, no _id"""
+    return [
+        {"id": str(uuid.uuid4()), "client_name": f"client-{i % 50}", "timestamp": datetime.utcnow()}
+        for i in range(count)
+    ]
+
+
+async def run_read_path_benchmark(server, rows: int, rounds: int) -> Dict[str, Any]:
+    """Compare validated and trusted rendering of a status page and the portfolio.
+
+    "status_validated" is what the status list did before the trusted read
+    path: StatusCheck(**doc) per row, then FastAPI's response_model pass
+    (dump, validate again, serialize) and json.dumps. "status_strict" is
+    STRICT_READ_MODELS; "status_trusted" serializes the rows as read.
+    """
+    from pydantic import TypeAdapter
+
+    adapter = TypeAdapter(List[server.StatusCheck])
+    docs = synthetic_status_rows(rows)
+    sources, _ = await server.fetch_portfolio_sources(server.FULL_VIEW)
+
+    async def status_validated(_):
+        models = [server.StatusCheck(**doc) for doc in docs]
+        value = adapter.validate_python([model.model_dump() for model in models])
+        json.dumps(adapter.dump_python(value, mode="json")).encode("utf-8")
+
+    async def status_strict(_):
+        server.dump_json([server.StatusCheck.model_validate(doc) for doc in docs])
+
+    async def status_trusted(_):
+        server.dump_json(docs)
+
+    def portfolio_build(strict: bool):
+        async def build(_):
+            server.STRICT_READ_MODELS = strict
+            try:
+                server.dump_json(server.build_portfolio_view(sources, server.FULL_VIEW))
+            finally:
+                server.STRICT_READ_MODELS = False
+        return build
+
+    results = {"rows": rows}
+    for name, fn in (
+        ("status_validated", status_validated),
+        ("status_strict", status_strict),
+        ("status_trusted", status_trusted),
+        ("portfolio_strict", portfolio_build(True)),
+        ("portfolio_trusted", portfolio_build(False)),
+    ):
+        results[name] = await measure(fn, rounds)
+        print(
+            f"read/{name:<18} {results[name]['mean_ms']:>9.2f}ms  cpu {results[name]['cpu_ms']:>9.2f}ms  "
+            f"peak {results[name]['peak_kib']:>9.1f}KiB"
+        )
+    return results
+
+
+def print_result(name: str, result: Dict[str, Any]):
+    print(
+        f"{name:<14} {result['rps']:>9.1f} req/s  "
+        f"p50 {result['p50_ms']:>7.2f}ms  p90 {result['p90_ms']:>7.2f}ms  "
+        f"p99 {result['p99_ms']:>7.2f}ms  max {result['max_ms']:>7.2f}ms  "
+        f"errors {result['errors']}"
+    )
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """List scenarios whose throughput fell or p99 rose by more than `threshold`"""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        rps_change = (result["rps"] - previous["rps"]) / previous["rps"] if previous["rps"] else 0.0
+        p99_change = (result["p99_ms"] - previous["p99_ms"]) / previous["p99_ms"] if previous["p99_ms"] else 0.0
+        print(f"{name:<14} rps {rps_change:+.1%}  p99 {p99_change:+.1%}")
+        if rps_change < -threshold or p99_change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo-url", default="", help="Benchmark against a real MongoDB instead of mongomock")
+    parser.add_argument("--db-name", default="portfolio_bench")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=100, help="Untimed requests per scenario")
+    parser.add_argument("--status-docs", type=int, default=1000, help="Status checks to seed before running")
+    parser.add_argument("--transform-docs", type=int, default=0,
+                        help="Also compare the legacy and pipelined document transforms on this many docs")
+    parser.add_argument("--transform-rounds", type=int, default=20)
+    parser.add_argument("--read-rows", type=int, default=0,
+                        help="Also compare validated and trusted reads on a status page of this many rows")
+    parser.add_argument("--read-rounds", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    print("🚀 Starting Portfolio Backend Benchmarks")
+    print("=" * 60)
+    report = asyncio.run(run_benchmarks(args))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        print("\n📊 COMPARISON WITH BASELINE")
+        print("=" * 60)
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
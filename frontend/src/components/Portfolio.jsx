@@ -11,24 +11,45 @@ import Navigation from './Navigation';
 import LoadingScreen from './LoadingScreen';
 import { mockPortfolioData } from '../data/mockData';
 
+// Portfolio JSON the backend embeds when it serves this page
+const readEmbeddedPortfolio = () => {
+  const element = document.getElementById('portfolio-data');
+  if (!element) return null;
+  try {
+    return JSON.parse(element.textContent);
+  } catch (error) {
+    return null;
+  }
+};
+
 const Portfolio = () => {
-  const [portfolioData, setPortfolioData] = useState(null);
-  const [loading, setLoading] = useState(true);
-  const [showContent, setShowContent] = useState(false);
+  const [embeddedData] = useState(readEmbeddedPortfolio);
+  const [portfolioData, setPortfolioData] = useState(embeddedData);
+  const [loading, setLoading] = useState(!embeddedData);
+  const [showContent, setShowContent] = useState(Boolean(embeddedData));
 
   useEffect(() => {
-    // Simulate realistic loading time for better UX
-    const loadData = () => {
-      setTimeout(() => {
-        setPortfolioData(mockPortfolioData);
-        setLoading(false);
-        // Small delay before showing content for smooth transition
-        setTimeout(() => setShowContent(true), 100);
-      }, 2500); // Longer delay for better loading experience
+    // Embedded data renders on first paint; nothing to load
+    if (embeddedData) return undefined;
+
+    // Without it (e.g. the dev server), fetch from the API and fall back to the bundled data
+    const controller = new AbortController();
+    const reveal = (data) => {
+      setPortfolioData(data);
+      setLoading(false);
+      // Small delay before showing content for smooth transition
+      setTimeout(() => setShowContent(true), 100);
     };
 
-    loadData();
-  }, []);
+    fetch(`${process.env.REACT_APP_BACKEND_URL || ''}/api/portfolio`, { signal: controller.signal })
+      .then((response) => (response.ok ? response.json() : Promise.reject(new Error(response.statusText))))
+      .then(reveal)
+      .catch((error) => {
+        if (error.name !== 'AbortError') reveal(mockPortfolioData);
+      });
+
+    return () => controller.abort();
+  }, [embeddedData]);
 
   const handleLoadingComplete = () => {
     setLoading(false);
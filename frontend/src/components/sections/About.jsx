@@ -11,6 +11,9 @@ const About = ({ data }) => {
     triggerOnce: true
   });
 
+  // The API's about section carries no metrics; only the bundled data does
+  const metrics = data.metrics || [];
+
   const highlights = [
     {
       icon: <Code className="h-6 w-6" />,
@@ -133,7 +136,7 @@ const About = ({ data }) => {
                 Key Achievements
               </h3>
               <div className="space-y-4">
-                {data.metrics.map((metric, index) => (
+                {metrics.map((metric, index) => (
                   <motion.div
                     key={index}
                     className="flex items-start gap-3 p-4 bg-gradient-to-r from-slate-800/40 to-slate-700/20 rounded-xl border border-slate-600/30 backdrop-blur-sm"
@@ -243,7 +246,7 @@ const About = ({ data }) => {
                   initial="hidden"
                   animate={inView ? "visible" : "hidden"}
                 >
-                  {data.metrics.map((metric, index) => (
+                  {metrics.map((metric, index) => (
                     <motion.div 
                       key={index}
                       variants={{
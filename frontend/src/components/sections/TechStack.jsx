@@ -1,7 +1,27 @@
 import React from 'react';
 import { motion } from 'framer-motion';
 import { useInView } from 'react-intersection-observer';
-import { Code, Database, Zap, Settings, FileText } from 'lucide-react';
+import { Code, Database, Zap, Settings, FileText, Cloud, Gauge, Wrench } from 'lucide-react';
+
+// Titles and icons for known categories; any other category is titled from its key
+const CATEGORY_META = {
+  frontend: { title: 'Frontend & Real-time UX', icon: Code },
+  designSystems: { title: 'Design Systems & Accessibility', icon: FileText },
+  backend: { title: 'Backend & APIs', icon: Database },
+  aiProductization: { title: 'AI Productization', icon: Zap },
+  reliability: { title: 'Reliability & DevOps', icon: Settings },
+  dataStreaming: { title: 'Data & Streaming', icon: Database },
+  performance: { title: 'Performance', icon: Gauge },
+  cloud: { title: 'Cloud & Infrastructure', icon: Cloud },
+  tools: { title: 'Tools', icon: Wrench },
+  methodologies: { title: 'Methodologies', icon: FileText }
+};
+
+const titleFromKey = (key) =>
+  key
+    .replace(/([a-z])([A-Z])/g, '$1 $2')
+    .replace(/[-_]+/g, ' ')
+    .replace(/^\w/, (letter) => letter.toUpperCase());
 
 const TechStack = ({ data = {} }) => {
   const [ref, inView] = useInView({
@@ -9,39 +29,13 @@ const TechStack = ({ data = {} }) => {
     triggerOnce: true
   });
 
-  const categories = [
-    { 
-      title: 'Frontend & Real-time UX', 
-      icon: Code, 
-      techs: data.frontend || []
-    },
-    { 
-      title: 'Design Systems & Accessibility', 
-      icon: FileText, 
-      techs: data.designSystems || []
-    },
-    { 
-      title: 'Backend & APIs', 
-      icon: Database, 
-      techs: data.backend || []
-    },
-    { 
-      title: 'AI Productization', 
-      icon: Zap, 
-      techs: data.aiProductization || []
-    },
-    { 
-      title: 'Reliability & DevOps', 
-      icon: Settings, 
-      techs: data.reliability || []
-    },
-    { 
-      title: 'Data & Streaming', 
-      icon: Database, 
-      techs: data.dataStreaming || []
-    }
-  ];
-
+  // Categories are whatever the portfolio stores, in stored order
+  const categories = Object.entries(data).map(([key, techs]) => ({
+    key,
+    title: CATEGORY_META[key]?.title || titleFromKey(key),
+    icon: CATEGORY_META[key]?.icon || Code,
+    techs: Array.isArray(techs) ? techs : []
+  }));
 
   return (
     <section id="tech-stack" className="relative overflow-hidden">
@@ -84,7 +78,7 @@ const TechStack = ({ data = {} }) => {
             const iconColor = colors[index % colors.length];
             return (
               <motion.div
-                key={index}
+                key={category.key}
                 className="glass-card group"
                 initial={{ y: 30, opacity: 0 }}
                 animate={inView ? { y: 0, opacity: 1 } : { y: 30, opacity: 0 }}
@@ -0,0 +1,52 @@
+"""Shared fixtures: the backend app on mongomock, started fresh for every test"""
+
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "portfolio_test")
+# mongomock has no change streams, and image variants are not under test
+os.environ["PORTFOLIO_CHANGE_STREAM"] = "false"
+os.environ["IMAGES_ENABLED"] = "false"
+os.environ["PORTFOLIO_BUS_DIR"] = ""
+os.environ["ADMIN_TOKEN"] = "test-admin-token"
+# Tests that exercise the limiter install their own
+os.environ["STATUS_RATE_LIMIT"] = "0"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import server  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+ADMIN_HEADERS = {"Authorization": "Bearer test-admin-token"}
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """The in-memory database the app connects to; populate it before starting the app"""
+    client = AsyncMongoMockClient()
+    monkeypatch.setattr(server, "create_mongo_client", lambda: client)
+    server.portfolio_cache.invalidate()
+    return client
+
+
+@pytest.fixture
+async def api(mongo):
+    """An HTTP client for the app, started on an empty in-memory database"""
+    await server.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+    finally:
+        await server.app.router.shutdown()
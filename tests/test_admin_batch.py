@@ -0,0 +1,129 @@
+"""Admin batch writes: optimistic versions, conflicts and reordering"""
+
+import pytest
+
+from .conftest import ADMIN_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+
+async def list_projects(api):
+    response = await api.get("/api/admin/projects", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def post_batch(api, batch):
+    return await api.post("/api/admin/projects/batch", json=batch, headers=ADMIN_HEADERS)
+
+
+async def test_requires_admin_token(api):
+    response = await api.get("/api/admin/projects")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+
+
+async def test_update_bumps_version(api):
+    first = (await list_projects(api))[0]
+    response = await post_batch(api, {"operations": [
+        {"op": "update", "id": first["id"], "version": first["version"], "fields": {"title": "Renamed"}},
+    ]})
+    assert response.status_code == 200
+    assert response.json()["modified"] == 1
+
+    updated = {doc["id"]: doc for doc in await list_projects(api)}[first["id"]]
+    assert updated["title"] == "Renamed"
+    assert updated["version"] == first["version"] + 1
+
+
+async def test_update_and_reorder_same_document(api):
+    docs = await list_projects(api)
+    first, second = docs[0], docs[1]
+    response = await post_batch(api, {
+        "operations": [
+            {"op": "update", "id": first["id"], "version": first["version"], "fields": {"title": "Moved"}},
+        ],
+        "order": [
+            {"id": second["id"], "version": second["version"]},
+            {"id": first["id"], "version": first["version"]},
+        ],
+    })
+    assert response.status_code == 200
+
+    after = {doc["id"]: doc for doc in await list_projects(api)}
+    assert after[first["id"]]["title"] == "Moved"
+    assert after[first["id"]]["order"] == 2
+    assert after[second["id"]]["order"] == 1
+    # One write per document, however many parts of the batch touch it
+    assert after[first["id"]]["version"] == first["version"] + 1
+    assert after[second["id"]]["version"] == second["version"] + 1
+
+
+async def test_stale_version_conflicts_without_writing(api):
+    docs = await list_projects(api)
+    first, second = docs[0], docs[1]
+    response = await post_batch(api, {
+        "operations": [
+            {"op": "update", "id": first["id"], "version": first["version"], "fields": {"title": "Fresh"}},
+            {"op": "update", "id": second["id"], "version": second["version"] + 5, "fields": {"title": "Stale"}},
+        ],
+    })
+    assert response.status_code == 409
+    detail = response.json()["detail"]
+    assert detail["applied"] is False
+    assert detail["conflicts"] == [
+        {"id": second["id"], "expected": second["version"] + 5, "current": second["version"]},
+    ]
+    assert await list_projects(api) == docs
+
+
+async def test_conflicting_reorder_leaves_order_untouched(api):
+    docs = await list_projects(api)
+    response = await post_batch(api, {"order": [
+        {"id": docs[1]["id"], "version": docs[1]["version"]},
+        {"id": docs[0]["id"], "version": docs[0]["version"] + 1},
+    ]})
+    assert response.status_code == 409
+    assert [c["id"] for c in response.json()["detail"]["conflicts"]] == [docs[0]["id"]]
+    assert [doc["order"] for doc in await list_projects(api)] == [doc["order"] for doc in docs]
+
+
+async def test_delete_and_insert(api):
+    docs = await list_projects(api)
+    response = await post_batch(api, {"operations": [
+        {"op": "delete", "id": docs[-1]["id"], "version": docs[-1]["version"]},
+        {"op": "insert", "fields": {
+            "title": "New", "description": "d", "impact": "i", "tech": ["Go"], "order": 99,
+        }},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["deleted"] == 1
+    after = {doc["id"]: doc for doc in await list_projects(api)}
+    assert docs[-1]["id"] not in after
+    assert after[body["inserted"][0]]["version"] == 1
+
+
+@pytest.mark.parametrize("batch", [
+    {},
+    {"operations": [{"op": "update", "id": "not-an-id", "fields": {}}]},
+    {"operations": [{"op": "update", "id": "{id}", "fields": {"bogus": 1}}]},
+    {"operations": [
+        {"op": "update", "id": "{id}", "fields": {"title": "a"}},
+        {"op": "delete", "id": "{id}"},
+    ]},
+    {"operations": [{"op": "delete", "id": "{id}"}], "order": [{"id": "{id}"}]},
+    {"operations": [{"op": "update", "id": "{id}", "version": 0, "fields": {}}], "order": [{"id": "{id}", "version": 3}]},
+])
+async def test_rejects_malformed_batches(api, batch):
+    doc_id = (await list_projects(api))[0]["id"]
+
+    def fill(value):
+        if isinstance(value, dict):
+            return {key: fill(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [fill(item) for item in value]
+        return doc_id if value == "{id}" else value
+
+    response = await post_batch(api, fill(batch))
+    assert response.status_code == 400
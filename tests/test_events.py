@@ -0,0 +1,92 @@
+"""Live updates: section-level fan-out over Server-Sent Events"""
+
+import asyncio
+
+import orjson
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+TENANT = server.DEFAULT_TENANT
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    """A fresh event hub for the app to run, settling writes quickly; request it before ``api``"""
+    hub = server.PortfolioEventHub()
+    monkeypatch.setattr(server, "event_hub", hub)
+    monkeypatch.setattr(server, "EVENTS_DEBOUNCE", 0.01)
+    yield hub
+    assert len(hub) == 0
+
+
+async def subscribe(hub):
+    hub.digests[TENANT] = (await hub.section_digests(TENANT))[0]
+    return hub.subscribe(TENANT)
+
+
+async def rename_first_project(title):
+    await server.db.projects.update_one({}, {"$set": {"title": title}})
+    server.invalidate_portfolio_cache(TENANT)
+
+
+async def test_only_changed_sections_are_pushed(hub, api):
+    first, second = await subscribe(hub), await subscribe(hub)
+    await rename_first_project("Renamed Project")
+    await asyncio.wait_for(first.ready.wait(), 2)
+
+    assert list(first.pending) == ["projects"]
+    # Each change is serialized once and shared by every subscriber
+    assert second.pending["projects"] is first.pending["projects"]
+    frame = first.pending["projects"].decode()
+    assert frame.startswith(f"id: {hub.digests[TENANT]['projects']}\nevent: section\n")
+    payload = orjson.loads(frame.split("data: ", 1)[1])
+    assert payload["etag"] == f'"{hub.digests[TENANT]["projects"]}"'
+    assert any(project["title"] == "Renamed Project" for project in payload["data"])
+
+    hub.unsubscribe(TENANT, first)
+    hub.unsubscribe(TENANT, second)
+    assert TENANT not in hub.subscribers
+    assert TENANT not in hub.digests
+
+
+async def test_unchanged_content_pushes_nothing(hub, api):
+    subscriber = await subscribe(hub)
+    server.invalidate_portfolio_cache(TENANT)
+    await asyncio.sleep(0.1)
+    assert not subscriber.ready.is_set()
+    hub.unsubscribe(TENANT, subscriber)
+
+
+async def test_stream_sends_hello_then_changes(hub, api):
+    request = FakeRequest()
+    stream = server.stream_portfolio_events(request, TENANT, await subscribe(hub))
+
+    hello = await stream.__anext__()
+    assert hello.startswith(b"retry: 5000\nevent: hello\ndata: ")
+    assert orjson.loads(hello.split(b"data: ", 1)[1])["etags"]["projects"] == f'"{hub.digests[TENANT]["projects"]}"'
+
+    await rename_first_project("Streamed Project")
+    frame = await asyncio.wait_for(stream.__anext__(), 2)
+    assert frame.count(b"event: section") == 1
+    assert b"Streamed Project" in frame
+
+    await stream.aclose()
+    assert len(hub) == 0
+
+
+async def test_unknown_tenant_is_404_without_a_subscriber(hub, api):
+    for tenant in ("nobody", "Not A Slug", "events"):
+        response = await api.get("/api/portfolio/events", params={"tenant": tenant})
+        assert response.status_code == 404
+    assert "nobody" not in hub.digests
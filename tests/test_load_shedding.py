@@ -0,0 +1,101 @@
+"""Per-client token buckets and the Mongo concurrency gate"""
+
+import pytest
+from fastapi import HTTPException
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def test_bucket_allows_burst_then_waits():
+    limiter = server.TokenBucketLimiter(rate=2, burst=3, max_keys=10)
+    assert [limiter.acquire({"a": 1}) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = limiter.acquire({"a": 1})
+    assert 0 < wait <= 0.5
+    # Other clients have their own bucket
+    assert limiter.acquire({"b": 1}) == 0.0
+
+
+def test_bucket_refills_over_time():
+    limiter = server.TokenBucketLimiter(rate=2, burst=3, max_keys=10)
+    limiter.acquire({"a": 3})
+    tokens, refilled_at = limiter.buckets["a"]
+    limiter.buckets["a"] = (tokens, refilled_at - 1)
+    assert limiter.acquire({"a": 2}) == 0.0
+    assert limiter.acquire({"a": 1}) > 0
+
+
+def test_bucket_charges_all_keys_or_none():
+    limiter = server.TokenBucketLimiter(rate=1, burst=2, max_keys=10)
+    limiter.acquire({"b": 2})
+    assert limiter.acquire({"a": 1, "b": 1}) > 0
+    assert "a" not in limiter.buckets
+
+
+def test_bucket_tracks_a_bounded_number_of_clients():
+    limiter = server.TokenBucketLimiter(rate=1, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire({key: 1})
+    assert list(limiter.buckets) == ["b", "c"]
+    # An evicted client starts over with a full bucket
+    assert limiter.acquire({"a": 1}) == 0.0
+
+
+async def test_gate_sheds_past_its_limit():
+    gate = server.ConcurrencyGate(limit=1)
+    async with gate.admit():
+        assert gate.in_flight == 1
+        with pytest.raises(HTTPException) as shed:
+            async with gate.admit():
+                pass
+        assert shed.value.status_code == 503
+        assert shed.value.headers["Retry-After"] == "1"
+    assert gate.in_flight == 0
+    async with gate.admit():
+        pass
+
+
+async def test_rate_limited_client_gets_429(api, monkeypatch):
+    monkeypatch.setattr(server, "STATUS_RATE_LIMIT", 1)
+    monkeypatch.setattr(server, "status_rate_limiter", server.TokenBucketLimiter(0.5, 2, 10))
+    statuses = [(await api.post("/api/status", json={"client_name": "noisy"})).status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+    limited = await api.post("/api/status", json={"client_name": "noisy"})
+    assert int(limited.headers["retry-after"]) >= 1
+    assert (await api.post("/api/status", json={"client_name": "quiet"})).status_code == 200
+    # A bulk request is charged per check, and is refused whole when any client is short
+    bulk = await api.post("/api/status/bulk", json=[{"client_name": "quiet"}, {"client_name": "noisy"}])
+    assert bulk.status_code == 429
+    assert await server.db.status_checks.count_documents({"client_name": "quiet"}) == 1
+
+
+async def test_full_gate_sheds_mongo_routes(api, monkeypatch):
+    monkeypatch.setattr(server.mongo_gate, "limit", 1)
+    monkeypatch.setattr(server.mongo_gate, "in_flight", 1)
+    for path in ("/api/status", "/api/status/export", "/api/status/stats"):
+        response = await api.get(path)
+        assert response.status_code == 503, path
+        assert response.headers["retry-after"] == "1"
+
+
+async def test_export_holds_its_slot_while_streaming(api, monkeypatch):
+    await server.db.status_checks.insert_many([
+        {"id": str(i), "client_name": "probe", "timestamp": server.datetime.utcnow()} for i in range(5)
+    ])
+    monkeypatch.setattr(server, "STATUS_EXPORT_BATCH_SIZE", 2)
+    in_flight = []
+    stream = server.stream_status_ndjson
+
+    async def observed(cursor):
+        async for chunk in stream(cursor):
+            in_flight.append(server.mongo_gate.in_flight)
+            yield chunk
+
+    monkeypatch.setattr(server, "stream_status_ndjson", observed)
+    response = await api.get("/api/status/export")
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 5
+    assert in_flight[:2] == [1, 1]
+    assert server.mongo_gate.in_flight == 0
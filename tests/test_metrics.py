@@ -0,0 +1,77 @@
+"""Prometheus metrics, including samples shared between worker processes"""
+
+import os
+import time
+
+import orjson
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def sibling_share(directory, pid):
+    share = server.MetricsShare(directory, interval=5)
+    share.worker = str(pid)
+    share.path = directory / f"metrics-{pid}.json"
+    return share
+
+
+def test_with_label_prepends_to_existing_labels():
+    assert server.with_label('requests{route="/a b"} 1', "worker", "7") == 'requests{worker="7",route="/a b"} 1'
+    assert server.with_label("entries 3", "worker", "7") == 'entries{worker="7"} 3'
+
+
+def test_single_worker_renders_unlabelled(monkeypatch):
+    monkeypatch.setattr(server, "metrics_share", None)
+    text = server.render_metrics()
+    assert text.count("# TYPE portfolio_cache_entries gauge") == 1
+    assert "\nportfolio_cache_entries " in text
+    assert "worker=" not in text
+
+
+def test_scrape_includes_live_siblings_once_per_family(tmp_path, monkeypatch):
+    share = server.MetricsShare(tmp_path, interval=5)
+    monkeypatch.setattr(server, "metrics_share", share)
+    sibling_share(tmp_path, 1).publish()
+    sibling_share(tmp_path, 2).publish()
+
+    text = server.render_metrics()
+    assert text.count("# HELP portfolio_cache_entries ") == 1
+    workers = {line.split('"')[1] for line in text.splitlines() if line.startswith("portfolio_cache_entries{")}
+    assert workers == {share.worker, "1", "2"}
+    lines = text.splitlines()
+    family = lines.index("# TYPE portfolio_cache_entries gauge")
+    # Siblings' samples stay inside their family, right after the header
+    assert all(line.startswith("portfolio_cache_entries{") for line in lines[family + 1:family + 4])
+
+
+def test_exited_workers_are_dropped(tmp_path, monkeypatch):
+    share = server.MetricsShare(tmp_path, interval=5)
+    monkeypatch.setattr(server, "metrics_share", share)
+    gone = sibling_share(tmp_path, 1)
+    gone.publish()
+    stale = time.time() - 60
+    os.utime(gone.path, (stale, stale))
+    (tmp_path / "metrics-2.json").write_bytes(b"{partial")
+
+    assert share.siblings() == []
+    assert not gone.path.exists()
+
+
+async def test_workers_publish_and_clean_up(mongo, tmp_path, monkeypatch):
+    share = server.MetricsShare(tmp_path, interval=60)
+    monkeypatch.setattr(server, "metrics_share", share)
+    await server.app.router.startup()
+    try:
+        for _ in range(50):
+            if share.path.exists():
+                break
+            await server.asyncio.sleep(0.01)
+        published = orjson.loads(share.path.read_bytes())
+        [sample] = published["portfolio_cache_entries"]
+        assert sample.startswith(f'portfolio_cache_entries{{worker="{share.worker}"}} ')
+    finally:
+        await server.app.router.shutdown()
+    assert not share.path.exists()
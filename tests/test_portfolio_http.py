@@ -0,0 +1,78 @@
+"""Portfolio responses: ETags, conditional requests and content-coding negotiation"""
+
+import gzip
+
+import brotli
+import orjson
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_encoding_follows_accept_encoding(api):
+    variants = {}
+    for accept in ("br, gzip", "gzip", "identity"):
+        response = await api.get("/api/portfolio", headers={"accept-encoding": accept})
+        assert response.status_code == 200
+        assert response.headers["vary"] == "Accept-Encoding"
+        variants[accept] = response
+
+    assert variants["br, gzip"].headers["content-encoding"] == "br"
+    assert variants["gzip"].headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in variants["identity"].headers
+    # Every coding carries the same document under its own strong tag
+    bodies = {accept: response.json() for accept, response in variants.items()}
+    assert bodies["br, gzip"] == bodies["gzip"] == bodies["identity"]
+    etags = {response.headers["etag"] for response in variants.values()}
+    assert len(etags) == 3
+    digest = variants["identity"].headers["etag"].strip('"')
+    assert variants["gzip"].headers["etag"] == f'"{digest}-gzip"'
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip;q=0, br;q=0", "identity"),
+    ("deflate, gzip", "gzip"),
+    ("*", "br"),
+    ("*;q=0, gzip", "gzip"),
+    ("", "identity"),
+])
+def test_choose_encoding(accept, expected):
+    assert server.choose_encoding(accept, {"identity": b"", "gzip": b"", "br": b""}) == expected
+
+
+async def test_if_none_match_answers_304(api):
+    first = await api.get("/api/portfolio/projects", headers={"accept-encoding": "gzip"})
+    etag = first.headers["etag"]
+
+    cached = await api.get("/api/portfolio/projects", headers={"accept-encoding": "gzip", "if-none-match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # A tag for another coding of the same content still matches
+    other = await api.get("/api/portfolio/projects", headers={"accept-encoding": "identity", "if-none-match": etag})
+    assert other.status_code == 304
+    assert other.headers["etag"] == etag.replace("-gzip", "")
+
+    stale = await api.get("/api/portfolio/projects", headers={"if-none-match": '"0123456789abcdef"'})
+    assert stale.status_code == 200
+
+
+async def test_write_changes_etag(api):
+    before = await api.get("/api/portfolio/projects")
+    await server.db.projects.update_one({"tenant": server.DEFAULT_TENANT}, {"$set": {"title": "Changed"}})
+    server.invalidate_portfolio_cache(server.DEFAULT_TENANT)
+
+    after = await api.get("/api/portfolio/projects", headers={"if-none-match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    assert "Changed" in [project["title"] for project in after.json()]
+
+
+def test_snapshot_variants_decode_to_the_same_body():
+    snapshot = server.PayloadSnapshot({"title": "Portfolio", "items": list(range(100))})
+    assert gzip.decompress(snapshot.encoded["gzip"]) == snapshot.body
+    assert brotli.decompress(snapshot.encoded["br"]) == snapshot.body
+    assert orjson.loads(snapshot.body)["items"][-1] == 99
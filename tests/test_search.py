@@ -0,0 +1,108 @@
+"""Search: ranking, prefix matching and in-place change events"""
+
+import pytest
+from bson import ObjectId
+
+import server
+
+from .conftest import ADMIN_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+
+def project(title, description="", tech=(), impact=""):
+    return {"id": str(ObjectId()), "title": title, "description": description, "tech": list(tech), "impact": impact}
+
+
+@pytest.fixture
+def index():
+    index = server.SearchIndex("test")
+    index.upsert("project", project("Kafka Pipeline", "Streams events", ["Kafka", "Python"]))
+    index.upsert("project", project("Dashboard", "Charts fed by a kafka topic", ["React"]))
+    index.upsert("project", project("Kubernetes Platform", "Cluster tooling in Go", ["Go", "Kubernetes"]))
+    index.upsert("experience", {
+        "id": str(ObjectId()), "company": "Acme", "position": "Engineer",
+        "description": "Built React dashboards", "achievements": ["Shipped <b>fast</b> charts"],
+    })
+    return index
+
+
+def titles(result):
+    return [hit["title"] for hit in result["hits"]]
+
+
+def test_title_match_outranks_description_match(index):
+    assert titles(index.search("kafka", [], None, 10)) == ["Kafka Pipeline", "Dashboard"]
+
+
+def test_documents_matching_more_terms_rank_first(index):
+    assert titles(index.search("react charts", [], None, 10))[0] == "Dashboard"
+
+
+def test_only_the_last_term_is_a_prefix(index):
+    assert titles(index.search("kube", [], None, 10)) == ["Kubernetes Platform"]
+    # Earlier terms must match whole tokens
+    assert index.search("kube go", [], None, 10)["hits"][0]["title"] == "Kubernetes Platform"
+    assert index.search("kube zzz", [], None, 10)["total"] == 0
+
+
+def test_compound_terms_match_their_parts():
+    index = server.SearchIndex("test")
+    index.upsert("project", project("API", "Node.js services with CI/CD", ["Node.js"]))
+    assert index.search("node", [], None, 10)["total"] == 1
+    assert index.search("ci/cd", [], None, 10)["total"] == 1
+
+
+def test_tech_and_kind_filters(index):
+    assert titles(index.search("", ["python"], None, 10)) == ["Kafka Pipeline"]
+    assert titles(index.search("kafka", ["React"], None, 10)) == ["Dashboard"]
+    assert [hit["kind"] for hit in index.search("react", [], "experience", 10)["hits"]] == ["experience"]
+    assert index.search("", ["Go", "Python"], None, 10)["total"] == 0
+
+
+def test_highlights_mark_matches_and_escape_markup(index):
+    hit = index.search("charts", [], "experience", 10)["hits"][0]
+    assert hit["highlights"]["achievements"] == "Shipped &lt;b&gt;fast&lt;/b&gt; <mark>charts</mark>"
+
+
+def test_change_events_apply_in_place(index):
+    _id = ObjectId()
+    change = {
+        "ns": {"coll": "projects"},
+        "operationType": "insert",
+        "fullDocument": {"_id": _id, "title": "Quantum Scheduler", "tech": ["Rust"]},
+    }
+    assert server.apply_search_change(index, change)
+    assert titles(index.search("quantum", [], None, 10)) == ["Quantum Scheduler"]
+
+    change.update(operationType="update", fullDocument={"_id": _id, "title": "Classical Scheduler", "tech": []})
+    assert server.apply_search_change(index, change)
+    assert index.search("quantum", [], None, 10)["total"] == 0
+    assert index.search("", ["rust"], None, 10)["total"] == 0
+
+    assert server.apply_search_change(index, {
+        "ns": {"coll": "projects"}, "operationType": "delete", "documentKey": {"_id": _id},
+    })
+    assert index.search("scheduler", [], None, 10)["total"] == 0
+
+
+def test_change_events_that_need_a_rebuild(index):
+    # Collections outside the index never require one; unreadable events do
+    assert server.apply_search_change(index, {"ns": {"coll": "tech_stack"}, "operationType": "update"})
+    assert not server.apply_search_change(index, {"ns": {"coll": "projects"}, "operationType": "update"})
+    assert not server.apply_search_change(index, {"ns": {"coll": "projects"}, "operationType": "drop"})
+
+
+async def test_search_endpoint_follows_writes(api):
+    assert (await api.get("/api/search")).status_code == 400
+    hits = (await api.get("/api/search", params={"q": "databricks", "kind": "project"})).json()["hits"]
+    assert hits and hits[0]["title"] == "Databricks Analytics Platform"
+
+    listed = (await api.get("/api/admin/projects", headers=ADMIN_HEADERS)).json()
+    target = next(doc for doc in listed if doc["title"] == "Databricks Analytics Platform")
+    response = await api.post("/api/admin/projects/batch", headers=ADMIN_HEADERS, json={"operations": [
+        {"op": "update", "id": target["id"], "version": target["version"], "fields": {"title": "Lakehouse Studio"}},
+    ]})
+    assert response.status_code == 200
+    hits = (await api.get("/api/search", params={"q": "lakehouse"})).json()["hits"]
+    assert [hit["id"] for hit in hits] == [target["id"]]
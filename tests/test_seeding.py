@@ -0,0 +1,65 @@
+"""Startup seeding: the seeded-version marker and the cross-worker lock"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def db(mongo):
+    server.connect_database()
+    try:
+        yield server.db
+    finally:
+        server.close_database()
+
+
+async def counts(db):
+    return {collection: await db[collection].count_documents({}) for collection in server.PORTFOLIO_COLLECTIONS}
+
+
+async def test_lock_admits_one_owner_until_it_expires(db):
+    assert await server.acquire_seed_lock("first") is True
+    assert await server.acquire_seed_lock("second") is False
+
+    await db.portfolio_meta.update_one(
+        {"_id": "seed_lock"}, {"$set": {"expiresAt": datetime.utcnow() - timedelta(seconds=1)}}
+    )
+    assert await server.acquire_seed_lock("second") is True
+    assert (await db.portfolio_meta.find_one({"_id": "seed_lock"}))["owner"] == "second"
+
+
+async def test_concurrent_starts_seed_once(db):
+    await asyncio.gather(*(server.init_portfolio_data() for _ in range(4)))
+    seeded = await counts(db)
+    assert seeded["portfolio_config"] == 1
+    assert all(seeded.values())
+
+    marker = await db.portfolio_meta.find_one({"_id": "seed"})
+    assert marker["version"] == server.SEED_VERSION
+    assert await db.portfolio_meta.find_one({"_id": "seed_lock"}) is None
+
+    await server.init_portfolio_data()
+    assert await counts(db) == seeded
+
+
+async def test_waiting_worker_returns_once_the_holder_finishes(db):
+    assert await server.acquire_seed_lock("holder")
+    waiter = asyncio.create_task(server.init_portfolio_data())
+    await asyncio.sleep(0.1)
+    assert not waiter.done()
+    # The waiter never seeds itself; it only watches for the holder's marker
+    await db.portfolio_meta.update_one({"_id": "seed"}, {"$set": {"version": server.SEED_VERSION}}, upsert=True)
+    await asyncio.wait_for(waiter, 2)
+    assert await db.portfolio_config.count_documents({}) == 0
+
+
+async def test_current_marker_skips_seeding(db):
+    await db.portfolio_meta.insert_one({"_id": "seed", "version": server.SEED_VERSION})
+    await server.init_portfolio_data()
+    assert await db.portfolio_config.count_documents({}) == 0
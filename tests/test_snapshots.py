@@ -0,0 +1,105 @@
+"""Static snapshots: content-hashed files, pruning and hot reload"""
+
+import gzip
+import os
+
+import orjson
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+TENANT = server.DEFAULT_TENANT
+
+
+async def rename_first_project(title):
+    await server.db.projects.update_one({}, {"$set": {"title": title}})
+
+
+def files_of(manifest):
+    return {
+        filename
+        for entry in manifest["files"].values()
+        for encoding, filename in entry.items()
+        if encoding != "digest"
+    }
+
+
+async def test_snapshot_files_match_the_api(api, tmp_path):
+    manifest = await server.write_portfolio_snapshot(tmp_path)
+    target = tmp_path / TENANT
+
+    assert orjson.loads((target / "manifest.json").read_bytes()) == manifest
+    assert manifest["previous"] is None
+    assert set(manifest["files"]) == {"portfolio", *server.PORTFOLIO_SECTIONS}
+    entry = manifest["files"]["portfolio"]
+    assert entry["identity"] == f"portfolio.{manifest['version']}.json"
+    body = (target / entry["identity"]).read_bytes()
+    assert gzip.decompress((target / entry["gzip"]).read_bytes()) == body
+
+    response = await api.get("/api/portfolio", headers={"accept-encoding": "identity"})
+    assert orjson.loads(body) == response.json()
+    assert response.headers["etag"] == f'"{manifest["version"]}"'
+
+
+async def test_previous_set_is_kept_and_older_ones_pruned(api, tmp_path):
+    target = tmp_path / TENANT
+    first = await server.write_portfolio_snapshot(tmp_path)
+    (target / ".in-progress.tmp").write_bytes(b"")
+
+    # Unchanged content leaves the manifest alone
+    assert (await server.write_portfolio_snapshot(tmp_path))["version"] == first["version"]
+    assert orjson.loads((target / "manifest.json").read_bytes())["generatedAt"] == first["generatedAt"]
+
+    await rename_first_project("Second Title")
+    second = await server.write_portfolio_snapshot(tmp_path)
+    assert second["previous"] == first["version"]
+    # Only the changed sections got new files
+    assert second["files"]["projects"] != first["files"]["projects"]
+    assert second["files"]["personal"] == first["files"]["personal"]
+    on_disk = {path.name for path in target.iterdir()}
+    assert files_of(first) | files_of(second) <= on_disk
+
+    await rename_first_project("Third Title")
+    third = await server.write_portfolio_snapshot(tmp_path)
+    on_disk = {path.name for path in target.iterdir()}
+    assert on_disk == files_of(second) | files_of(third) | {"manifest.json", ".in-progress.tmp"}
+    assert first["files"]["projects"]["identity"] not in on_disk
+
+
+async def test_store_reloads_when_the_manifest_changes(api, tmp_path):
+    store = server.SnapshotStore(tmp_path, check_interval=0)
+    assert store.get(TENANT, "portfolio") is None
+
+    first = await server.write_portfolio_snapshot(tmp_path)
+    loaded = store.get(TENANT, "portfolio")
+    assert loaded.digest == first["version"]
+    assert store.get(TENANT, "projects").digest == first["files"]["projects"]["digest"]
+    assert store.get(TENANT, "portfolio") is loaded
+
+    await rename_first_project("Reloaded Title")
+    second = await server.write_portfolio_snapshot(tmp_path)
+    manifest_path = tmp_path / TENANT / "manifest.json"
+    # Coarse filesystem clocks can give both manifests the same mtime
+    mtime = manifest_path.stat().st_mtime_ns + 1_000_000
+    os.utime(manifest_path, ns=(mtime, mtime))
+    assert store.get(TENANT, "portfolio").digest == second["version"]
+
+    manifest_path.write_bytes(b"not json")
+    os.utime(manifest_path, ns=(mtime + 1_000_000, mtime + 1_000_000))
+    # A broken manifest keeps serving the last good set
+    assert store.get(TENANT, "portfolio").digest == second["version"]
+
+
+async def test_api_serves_from_the_store(api, tmp_path, monkeypatch):
+    manifest = await server.write_portfolio_snapshot(tmp_path)
+    monkeypatch.setattr(server, "snapshot_store", server.SnapshotStore(tmp_path, check_interval=60))
+    # Diverge the database, so a response matching the snapshot came from disk
+    await rename_first_project("Not Yet Snapshotted")
+    server.invalidate_portfolio_cache(TENANT)
+
+    response = await api.get("/api/portfolio/projects", headers={"accept-encoding": "br"})
+    assert response.headers["etag"] == f'"{manifest["files"]["projects"]["digest"]}-br"'
+    assert response.headers["content-encoding"] == "br"
+    assert "Not Yet Snapshotted" not in response.text
@@ -0,0 +1,69 @@
+"""The SPA shell served at / with the portfolio embedded"""
+
+import os
+import re
+
+import orjson
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+TEMPLATE = b"<!doctype html><html><head><title>Portfolio</title></head><body><div id=\"root\"></div></body></html>"
+EMBEDDED = re.compile(rb'<script id="portfolio-data" type="application/json" data-version="(\w+)">(.*?)</script>', re.S)
+
+
+@pytest.fixture
+def shell(tmp_path, monkeypatch):
+    index = tmp_path / "index.html"
+    index.write_bytes(TEMPLATE)
+    spa_shell = server.SpaShell(index)
+    monkeypatch.setattr(server, "spa_shell", spa_shell)
+    return spa_shell
+
+
+def test_render_escapes_markup_in_the_data(shell):
+    shell.load()
+    data = server.PayloadSnapshot({"title": "</script><script>alert(1)</script>", "note": "<!-- x"})
+    page = shell.render(data)
+
+    assert page.count(b"</script>") == 1
+    assert b"<!--" not in page
+    assert page.index(b'id="portfolio-data"') < page.index(b"</head>")
+    version, body = EMBEDDED.search(page).groups()
+    assert version.decode() == data.digest
+    # The escapes are valid JSON, so the client reads back the original strings
+    assert orjson.loads(body) == {"title": "</script><script>alert(1)</script>", "note": "<!-- x"}
+
+
+def test_render_without_data_is_the_plain_template(shell):
+    shell.load()
+    assert shell.render(None) == TEMPLATE
+
+
+def test_template_reloads_when_the_build_changes(shell):
+    first = shell.load()
+    shell.path.write_bytes(TEMPLATE.replace(b"Portfolio", b"Rebuilt"))
+    os.utime(shell.path, ns=(first + 1_000_000, first + 1_000_000))
+    assert shell.load() != first
+    assert b"Rebuilt" in shell.render(None)
+
+
+async def test_index_embeds_the_api_portfolio(api, shell):
+    page = await api.get("/", headers={"accept-encoding": "gzip"})
+    assert page.status_code == 200
+    assert page.headers["content-type"] == "text/html; charset=utf-8"
+    version, body = EMBEDDED.search(page.content).groups()
+
+    portfolio = await api.get("/api/portfolio", headers={"accept-encoding": "identity"})
+    assert orjson.loads(body) == portfolio.json()
+    assert f'"{version.decode()}"' == portfolio.headers["etag"]
+
+    cached = await api.get("/", headers={"accept-encoding": "gzip", "if-none-match": page.headers["etag"]})
+    assert cached.status_code == 304
+
+
+async def test_index_without_a_build_is_404(api, shell):
+    shell.path.unlink()
+    assert (await api.get("/")).status_code == 404
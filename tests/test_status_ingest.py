@@ -0,0 +1,58 @@
+"""Status ingestion: bulk inserts and the write-behind buffer"""
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_insert_returns_every_check(api):
+    response = await api.post("/api/status/bulk", json=[{"client_name": f"c{i}"} for i in range(5)])
+    assert response.status_code == 200
+    assert [check["client_name"] for check in response.json()] == [f"c{i}" for i in range(5)]
+    assert await server.db.status_checks.count_documents({}) == 5
+
+
+async def test_bulk_insert_is_capped(api, monkeypatch):
+    monkeypatch.setattr(server, "STATUS_BULK_MAX", 2)
+    response = await api.post("/api/status/bulk", json=[{"client_name": "c"}] * 3)
+    assert response.status_code == 413
+
+
+async def test_buffer_drains_on_shutdown(api, monkeypatch):
+    buffer = server.StatusWriteBuffer(max_size=100, flush_interval=60)
+    monkeypatch.setattr(server, "STATUS_WRITE_BUFFER", True)
+    monkeypatch.setattr(server, "status_buffer", buffer)
+    buffer.start()
+    db = server.db
+
+    for _ in range(3):
+        assert (await api.post("/api/status", json={"client_name": "buffered"})).status_code == 200
+    assert buffer.depth == 3
+    assert await db.status_checks.count_documents({}) == 0
+
+    await server.app.router.shutdown()
+    assert buffer.depth == 0
+    assert buffer.flushed == 3
+    assert await db.status_checks.count_documents({"client_name": "buffered"}) == 3
+    rollup = await db.status_rollups.find_one({"granularity": "hour", "client_name": "buffered"})
+    assert rollup["count"] == 3
+
+
+async def test_full_buffer_flushes_without_waiting(api, monkeypatch):
+    buffer = server.StatusWriteBuffer(max_size=2, flush_interval=60)
+    monkeypatch.setattr(server, "STATUS_WRITE_BUFFER", True)
+    monkeypatch.setattr(server, "status_buffer", buffer)
+    buffer.start()
+    try:
+        for _ in range(2):
+            await api.post("/api/status", json={"client_name": "burst"})
+        for _ in range(50):
+            if buffer.flushed:
+                break
+            await server.asyncio.sleep(0.01)
+        assert buffer.flushed == 2
+        assert await server.db.status_checks.count_documents({}) == 2
+    finally:
+        await buffer.close()
@@ -0,0 +1,53 @@
+"""Status checks: keyset paging over (timestamp, id)"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_checks(count, client_name="probe", start=None):
+    """Insert checks with every timestamp shared by two of them, to exercise the id tie-break"""
+    start = start or datetime(2024, 1, 1, 12, 0)
+    docs = [
+        {"id": f"check-{i:03d}", "client_name": client_name, "timestamp": start + timedelta(seconds=i // 2)}
+        for i in range(count)
+    ]
+    await server.db.status_checks.insert_many(docs)
+    return docs
+
+
+async def test_keyset_pages_cover_every_check_once(api):
+    docs = await seed_checks(25)
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await api.get("/api/status", params=params)
+        assert response.status_code == 200
+        seen.extend(check["id"] for check in response.json())
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            assert "link" not in response.headers
+            break
+        assert 'rel="next"' in response.headers["link"]
+
+    assert pages == 3
+    newest_first = sorted(docs, key=lambda doc: (doc["timestamp"], doc["id"]), reverse=True)
+    assert seen == [doc["id"] for doc in newest_first]
+
+
+async def test_paging_filters_by_client(api):
+    await seed_checks(6, "alpha")
+    await seed_checks(4, "beta", start=datetime(2024, 1, 2))
+    response = await api.get("/api/status", params={"client_name": "alpha", "limit": 50})
+    assert {check["client_name"] for check in response.json()} == {"alpha"}
+    assert len(response.json()) == 6
+
+
+async def test_invalid_cursor_is_rejected(api):
+    response = await api.get("/api/status", params={"cursor": "not a cursor"})
+    assert response.status_code == 400
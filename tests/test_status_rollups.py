@@ -0,0 +1,46 @@
+"""Status checks: per-client minute and hour rollups"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_ingest_updates_rollups(api):
+    for _ in range(3):
+        assert (await api.post("/api/status", json={"client_name": "alpha"})).status_code == 200
+    response = await api.post("/api/status/bulk", json=[{"client_name": "alpha"}, {"client_name": "beta"}])
+    assert response.status_code == 200
+
+    rollups = await server.db.status_rollups.find({}, {"_id": 0}).to_list(None)
+    counts = {}
+    for rollup in rollups:
+        key = (rollup["granularity"], rollup["client_name"])
+        counts[key] = counts.get(key, 0) + rollup["count"]
+    assert counts == {("minute", "alpha"): 4, ("minute", "beta"): 1, ("hour", "alpha"): 4, ("hour", "beta"): 1}
+    assert all(("expiresAt" in rollup) == (rollup["granularity"] == "minute") for rollup in rollups)
+
+
+async def test_stats_accept_aware_bounds(api):
+    await api.post("/api/status/bulk", json=[{"client_name": "alpha"}] * 2 + [{"client_name": "beta"}])
+    since = datetime.now(timezone.utc) - timedelta(hours=2)
+    response = await api.get("/api/status/stats", params={"granularity": "hour", "since": since.isoformat()})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 3
+    assert body["topClients"] == [{"count": 2, "client_name": "alpha"}, {"count": 1, "client_name": "beta"}]
+
+
+async def test_backfill_is_idempotent(api):
+    start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=3)
+    await server.db.status_checks.insert_many([
+        {"id": f"legacy-{i}", "client_name": "legacy", "timestamp": start + timedelta(minutes=i)} for i in range(6)
+    ])
+    cutoff = server.truncate_timestamp(datetime.utcnow(), "hour")
+    for _ in range(2):
+        await server.backfill_status_rollups(cutoff)
+    hourly = await server.db.status_rollups.find({"granularity": "hour", "client_name": "legacy"}).to_list(None)
+    assert [rollup["count"] for rollup in hourly] == [6]
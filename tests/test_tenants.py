@@ -0,0 +1,75 @@
+"""Multi-tenant serving: isolation, slugs and the legacy single-tenant migration"""
+
+import pytest
+from bson import ObjectId
+
+import server
+
+from .conftest import ADMIN_HEADERS
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_tenants_are_isolated(api):
+    await server.seed_portfolio_data("acme")
+    await server.db.portfolio_config.update_one({"tenant": "acme"}, {"$set": {"personal.name": "Acme Person"}})
+    server.invalidate_portfolio_cache("acme")
+
+    acme = await api.get("/api/portfolio/acme")
+    default = await api.get("/api/portfolio")
+    assert acme.status_code == default.status_code == 200
+    assert acme.json()["personal"]["name"] == "Acme Person"
+    assert default.json()["personal"]["name"] != "Acme Person"
+    assert (await api.get("/api/portfolio/acme/personal")).json()["name"] == "Acme Person"
+
+
+async def test_admin_writes_stay_within_their_tenant(api):
+    await server.seed_portfolio_data("acme")
+    project = await server.db.projects.find_one({"tenant": server.DEFAULT_TENANT})
+    response = await api.post("/api/admin/projects/batch", headers=ADMIN_HEADERS, json={
+        "tenant": "acme",
+        "operations": [{"op": "update", "id": str(project["_id"]), "version": 0, "fields": {"title": "Hijacked"}}],
+    })
+    assert response.status_code == 409
+    assert (await server.db.projects.find_one({"_id": project["_id"]}))["title"] == project["title"]
+
+
+@pytest.mark.parametrize("path, status", [
+    ("/api/portfolio/nobody", 404),
+    ("/api/portfolio/Not_A_Slug", 404),
+    ("/api/portfolio/nobody/projects", 404),
+    ("/api/portfolio/acme/bogus", 404),
+    ("/api/portfolio/projects", 200),
+])
+async def test_unknown_and_reserved_slugs(api, path, status):
+    await server.seed_portfolio_data("acme")
+    assert (await api.get(path)).status_code == status
+
+
+@pytest.mark.parametrize("slug", sorted(server.RESERVED_SLUGS))
+def test_reserved_slugs_are_never_tenants(slug):
+    with pytest.raises(server.HTTPException) as rejected:
+        server.check_tenant_slug(slug)
+    assert rejected.value.status_code == 404
+
+
+async def test_startup_migrates_a_double_seeded_legacy_database(mongo):
+    db = mongo[server.os.environ["DB_NAME"]]
+    legacy_config = {"personal": {"name": "Legacy"}, "about": {}, "lookingFor": {}}
+    first, second = ObjectId(), ObjectId()
+    await db.portfolio_config.insert_many([dict(legacy_config, _id=first), dict(legacy_config, _id=second)])
+    await db.experiences.insert_many([
+        {"company": "Databricks", "position": "Engineer", "order": 1},
+        {"company": "Databricks", "position": "Engineer", "order": 1},
+    ])
+
+    await server.app.router.startup()
+    try:
+        configs = await db.portfolio_config.find({}).to_list(None)
+        assert [(config["_id"], config["tenant"]) for config in configs] == [(first, server.DEFAULT_TENANT)]
+        assert await db.experiences.count_documents({"company": "Databricks"}) == 1
+        assert await db.experiences.count_documents({"tenant": {"$exists": False}}) == 0
+        indexes = await db.portfolio_config.index_information()
+        assert indexes["tenant_1"]["unique"] is True
+    finally:
+        await server.app.router.shutdown()